@@ -1,3 +1,5 @@
+import asyncio
+import json
 import os
 import shutil
 import urllib.request
@@ -9,7 +11,7 @@ from uuid import UUID
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, HTTPException
 from fastapi import Path as PathParam
 from fastapi import Query, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
 from app.config.settings import settings
 from app.models.document import (
@@ -18,6 +20,7 @@ from app.models.document import (
     DocumentStatus,
     DocumentUploadRequest,
     DocumentUploadResponse,
+    EmbeddingBatchQueryRequest,
     ProcessingStep,
     StepStatus,
     TableInfo,
@@ -31,7 +34,7 @@ from app.services.document_processor import (
     process_document,
     save_document,
 )
-from app.services.embedding import get_collection_info, query_embeddings
+from app.services.embedding import get_collection_info, query_embeddings, query_embeddings_batch
 
 router = APIRouter(prefix=settings.API_V1_STR)
 
@@ -305,6 +308,65 @@ async def get_document_status(document_id: UUID = PathParam(..., description="Th
     )
 
 
+@router.get("/documents/{document_id}/events")
+async def stream_document_events(
+    document_id: UUID = PathParam(..., description="The ID of the document"),
+    interval: float = Query(1.0, ge=0.2, le=30.0, description="Seconds between status checks")
+):
+    """
+    Stream a document's processing status as Server-Sent Events.
+    
+    A frame is sent whenever the status changes, and the stream closes once the
+    document is processed, has failed, or is deleted. This replaces repeated
+    polling of GET /documents/{document_id} with a single connection.
+    
+    Args:
+        document_id: The ID of the document
+        interval: Seconds between status checks
+        
+    Returns:
+        StreamingResponse of text/event-stream frames
+    """
+    if not get_document(document_id):
+        raise HTTPException(status_code=404, detail=f"Document with ID {document_id} not found")
+    
+    async def events():
+        last_state = None
+        while True:
+            document = get_document(document_id)
+            if not document:
+                break
+            
+            current_step = next(
+                (step_info.step.value for step_info in document.processing_steps
+                 if step_info.status == StepStatus.IN_PROGRESS),
+                None
+            )
+            state = {
+                "id": str(document.id),
+                "status": document.status.value,
+                "processing_progress": calculate_processing_progress(document),
+                "current_step": current_step,
+                "error_message": document.error_message
+            }
+            if state != last_state:
+                yield f"data: {json.dumps(state)}\n\n"
+                last_state = state
+            else:
+                # Comment frame keeps idle connections and client read timeouts alive
+                yield ": keep-alive\n\n"
+            
+            if document.status in (DocumentStatus.PROCESSED, DocumentStatus.FAILED):
+                break
+            await asyncio.sleep(interval)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.post("/documents/{document_id}/process")
 async def start_document_processing(
     document_id: UUID = PathParam(..., description="The ID of the document"),
@@ -480,6 +542,60 @@ async def get_document_embeddings(
     }
 
 
+@router.post("/documents/{document_id}/embeddings/batch")
+async def batch_query_document_embeddings(
+    document_id: UUID = PathParam(..., description="The ID of the document"),
+    request: EmbeddingBatchQueryRequest = Body(...)
+):
+    """
+    Query the document embeddings with several queries in one request.
+    
+    The queries are embedded together and searched in a single collection
+    query instead of one request per query.
+    
+    Args:
+        document_id: The ID of the document
+        request: The queries, result limit and optional page filter
+        
+    Returns:
+        Collection info and one list of matching chunks per query, in order
+    """
+    document = get_document(document_id)
+    
+    if not document:
+        raise HTTPException(status_code=404, detail=f"Document with ID {document_id} not found")
+    
+    if document.status != DocumentStatus.PROCESSED:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Document embeddings not available. Current status: {document.status}"
+        )
+    
+    if not document.embedding_collection_name:
+        raise HTTPException(status_code=400, detail="Document embeddings not generated")
+    
+    # Prepare filters
+    filters = {}
+    if request.page is not None:
+        filters["page_number"] = request.page
+    
+    # Query embeddings
+    results = await query_embeddings_batch(
+        collection_name=document.embedding_collection_name,
+        query_texts=request.queries,
+        n_results=request.limit,
+        filters=filters
+    )
+    
+    # Get collection info
+    collection_info = await get_collection_info(document.embedding_collection_name)
+    
+    return {
+        "collection_info": collection_info,
+        "results": results
+    }
+
+
 @router.get("/documents/{document_id}/original")
 async def download_original_document(document_id: UUID = PathParam(..., description="The ID of the document")):
     """
@@ -507,14 +623,29 @@ async def download_original_document(document_id: UUID = PathParam(..., descript
 
 
 @router.get("/documents", response_model=List[DocumentResponse])
-async def get_all_documents():
+async def get_all_documents(
+    ids: Optional[str] = Query(None, description="Comma-separated document IDs to return instead of all documents")
+):
     """
-    Get a list of all documents.
+    Get a list of all documents, or only those listed in ids.
     
+    Args:
+        ids: Optional comma-separated document IDs; unknown or malformed IDs are skipped
+        
     Returns:
         List of DocumentResponse objects
     """
-    documents = list_documents()
+    if ids:
+        documents = []
+        for raw_id in ids.split(","):
+            try:
+                document = get_document(UUID(raw_id.strip()))
+            except ValueError:
+                continue
+            if document:
+                documents.append(document)
+    else:
+        documents = list_documents()
     
     # Format response
     response = []
@@ -19,6 +19,8 @@ from app.frontend.callbacks import Callbacks
 from app.frontend.components import UIComponents
 from app.frontend.config import (
     API_BASE_URL,
+    API_CONNECT_TIMEOUT,
+    API_HEALTH_TIMEOUT,
     API_MAX_RETRIES,
     API_RETRY_DELAY,
     API_TIMEOUT,
@@ -27,6 +29,7 @@ from app.frontend.config import (
     DEFAULT_LLM_MODEL,
     DEFAULT_LLM_PROVIDER,
     ERROR_MESSAGES,
+    FAILURE_CACHE_TTL,
     ICONS,
     LLM_PROVIDERS,
     MAX_DOCUMENTS_PER_SESSION,
@@ -44,7 +47,10 @@ from app.frontend.utils import (
     format_duration,
     format_file_size,
     generate_session_name,
+    join_api_url,
+    normalize_query,
     parse_duration,
+    parse_iso_datetime,
     truncate_text,
 )
 
@@ -62,17 +68,23 @@ __all__ = [
     "ResponseAnalyzer",
     "ResponseType",
     "format_datetime",
+    "parse_iso_datetime",
     "format_file_size",
     "truncate_text",
     "parse_duration",
     "format_duration",
     "generate_session_name",
+    "join_api_url",
+    "normalize_query",
     "API_BASE_URL",
+    "API_CONNECT_TIMEOUT",
+    "API_HEALTH_TIMEOUT",
     "API_TIMEOUT",
     "API_MAX_RETRIES",
     "API_RETRY_DELAY",
     "CACHE_TTL",
     "CACHE_MAX_ENTRIES",
+    "FAILURE_CACHE_TTL",
     "MAX_SESSIONS_PER_USER",
     "MAX_MESSAGES_PER_SESSION",
     "UI_THEME",
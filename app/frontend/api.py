@@ -1,21 +1,45 @@
+import json
 import os
+import threading
 import time
-from functools import wraps
-from typing import Any, Dict, List, Optional
+from functools import update_wrapper, wraps
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
 
 import requests
 import streamlit as st
 from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.frontend.config import (
     API_BASE_URL,
+    API_CONNECT_TIMEOUT,
+    API_HEALTH_TIMEOUT,
     API_MAX_RETRIES,
     API_RETRY_DELAY,
     API_TIMEOUT,
     CACHE_MAX_ENTRIES,
     CACHE_TTL,
+    FAILURE_CACHE_TTL,
 )
-from app.frontend.utils import retry_with_backoff
+from app.frontend.utils import join_api_url, retry_with_backoff
+
+
+# One pooled session for every API call, so requests reuse keep-alive connections.
+# Transient gateway errors and failed connects are retried for idempotent
+# methods only; POSTs are never replayed, so an upload can't be duplicated.
+# Read timeouts are not retried, so a hung backend costs one API_TIMEOUT.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=2, connect=2, read=0, status=2,
+        backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False
+    )
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
 
 
 def cached(ttl: int = CACHE_TTL, maxsize: int = CACHE_MAX_ENTRIES):
@@ -36,6 +60,72 @@ def cached(ttl: int = CACHE_TTL, maxsize: int = CACHE_MAX_ENTRIES):
             result = func(*args, **kwargs)
             cache[cache_key] = result
             return result
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+class _Uncached(Exception):
+    """Carries a failure result out of a cached function so it isn't stored."""
+    
+    def __init__(self, result: Any):
+        super().__init__()
+        self.result = result
+
+
+def cache_success(failure_ttl: float = FAILURE_CACHE_TTL, **cache_kwargs):
+    """Like st.cache_data, but failed requests are only cached briefly.
+
+    The wrapped function reports a failure by raising _Uncached(result): the
+    result is returned to the caller as usual and held for failure_ttl
+    seconds, long enough that the rest of the script run reuses it instead
+    of repeating the failing request (and its error message), but short
+    enough that the next rerun retries.
+
+    The wrapper's clear() drops every entry. invalidate(*args, **kwargs)
+    drops only the entry for those arguments, by moving them to a new cache
+    generation; the stale entry ages out with the TTL.
+    """
+    def decorator(func):
+        generations = {}
+        failures = TTLCache(maxsize=256, ttl=failure_ttl)
+        failures_lock = threading.Lock()  # Sessions run on separate threads
+        
+        def versioned(*args, generation=0, **kwargs):
+            return func(*args, **kwargs)
+        # Keyed by func's name and source, and positional args by func's names
+        update_wrapper(versioned, func)
+        cached_func = st.cache_data(**cache_kwargs)(versioned)
+        
+        def generation_key(args, kwargs):
+            return repr((args, sorted(kwargs.items())))
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = generation_key(args, kwargs)
+            with failures_lock:
+                if key in failures:
+                    return failures[key]
+            try:
+                return cached_func(*args, generation=generations.get(key, 0), **kwargs)
+            except _Uncached as failure:
+                with failures_lock:
+                    failures[key] = failure.result
+                return failure.result
+        
+        def clear():
+            with failures_lock:
+                failures.clear()
+            cached_func.clear()
+        
+        def invalidate(*args, **kwargs):
+            key = generation_key(args, kwargs)
+            with failures_lock:
+                failures.pop(key, None)
+            generations[key] = generations.get(key, 0) + 1
+        
+        wrapper.clear = clear
+        wrapper.invalidate = invalidate
         return wrapper
     return decorator
 
@@ -46,16 +136,16 @@ class APIClient:
     @staticmethod
     def join_url(path: str) -> str:
         """Join API base URL with path."""
-        return f"{API_BASE_URL.rstrip('/')}/{path.lstrip('/')}"
+        return join_api_url(API_BASE_URL, path)
     
     @staticmethod
-    @cached(ttl=CACHE_TTL, maxsize=1)
+    @cached(ttl=15, maxsize=1)
     def check_health() -> bool:
-        """Check API health with caching."""
+        """Check API health, cached briefly so reruns don't each ping the backend."""
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 APIClient.join_url("health"),
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_HEALTH_TIMEOUT)
             )
             return response.status_code == 200
         except:
@@ -66,9 +156,9 @@ class APIClient:
     @retry_with_backoff(max_retries=API_MAX_RETRIES, initial_delay=API_RETRY_DELAY)
     def get_chat_sessions() -> List[Dict[str, Any]]:
         """Get all chat sessions with caching and retry logic."""
-        response = requests.get(
+        response = _SESSION.get(
             APIClient.join_url("chat/sessions"),
-            timeout=API_TIMEOUT
+            timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
         )
         if response.status_code == 200:
             return response.json()
@@ -76,34 +166,34 @@ class APIClient:
         return []
     
     @staticmethod
-    @cached(ttl=CACHE_TTL, maxsize=CACHE_MAX_ENTRIES)
+    @cache_success(ttl=15, show_spinner=False)
     def get_chat_session(session_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific chat session with caching."""
+        """Get a specific chat session, cached briefly per session ID."""
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 APIClient.join_url(f"chat/sessions/{session_id}"),
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             if response.status_code == 200:
                 return response.json()
-            elif response.status_code == 404:
-                st.error("Chat session not found.")
-            else:
-                st.error(f"Failed to get chat session: {response.status_code}")
-            return None
         except Exception as e:
             st.error(f"Error getting chat session: {str(e)}")
-            return None
+            raise _Uncached(None)
+        if response.status_code == 404:
+            st.error("Chat session not found.")
+        else:
+            st.error(f"Failed to get chat session: {response.status_code}")
+        raise _Uncached(None)
     
     @staticmethod
     @retry_with_backoff(max_retries=API_MAX_RETRIES, initial_delay=API_RETRY_DELAY)
     def create_chat_session(**kwargs) -> Optional[Dict[str, Any]]:
         """Create a new chat session."""
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url("chat/sessions"),
                 json=kwargs,
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             if response.status_code == 201:
                 # Clear relevant caches
@@ -126,9 +216,9 @@ class APIClient:
             exact_endpoint = f"{API_BASE_URL.rstrip('/')}/chat/sessions/{session_id}"
             print(f"DEBUG: Attempting to delete session {session_id} using endpoint: {exact_endpoint}")
             
-            response = requests.delete(
+            response = _SESSION.delete(
                 exact_endpoint,
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             
             # Log detailed response for debugging
@@ -141,10 +231,7 @@ class APIClient:
                     APIClient.get_chat_sessions.cache_clear()
                 except:
                     pass
-                try:
-                    APIClient.get_chat_session.cache_clear()
-                except:
-                    pass
+                APIClient.get_chat_session.invalidate(session_id)
                 return True
             else:
                 st.error(f"Failed to delete chat session: {response.status_code}")
@@ -159,43 +246,43 @@ class APIClient:
         """Rename a chat session."""
         try:
             # Try first endpoint (chat/sessions/{id})
-            response = requests.patch(
+            response = _SESSION.patch(
                 APIClient.join_url(f"chat/sessions/{session_id}"),
                 json={"name": new_name},
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             
             # If 404, try alternative endpoint (chats/{id})
             if response.status_code == 404:
-                alt_response = requests.patch(
+                alt_response = _SESSION.patch(
                     APIClient.join_url(f"chat/{session_id}"),
                     json={"name": new_name},
-                    timeout=API_TIMEOUT
+                    timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
                 )
                 
                 # If that fails too, try another format (chats/{id})
                 if alt_response.status_code == 404:
-                    final_response = requests.patch(
+                    final_response = _SESSION.patch(
                         APIClient.join_url(f"chats/{session_id}"),
                         json={"name": new_name},
-                        timeout=API_TIMEOUT
+                        timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
                     )
                     if final_response.status_code in (200, 204):
                         # Clear relevant caches
                         APIClient.get_chat_sessions.cache_clear()
-                        APIClient.get_chat_session.cache_clear()
+                        APIClient.get_chat_session.invalidate(session_id)
                         return True
                 
                 if alt_response.status_code in (200, 204):
                     # Clear relevant caches
                     APIClient.get_chat_sessions.cache_clear()
-                    APIClient.get_chat_session.cache_clear()
+                    APIClient.get_chat_session.invalidate(session_id)
                     return True
             
             if response.status_code in (200, 204):
                 # Clear relevant caches
                 APIClient.get_chat_sessions.cache_clear()
-                APIClient.get_chat_session.cache_clear()
+                APIClient.get_chat_session.invalidate(session_id)
                 return True
                 
             return False
@@ -208,14 +295,14 @@ class APIClient:
     def send_message(session_id: str, message: str, context_window: int = 5) -> Optional[Dict[str, Any]]:
         """Send a message to a chat session."""
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url(f"chat/sessions/{session_id}/messages"),
                 json={"text": message, "context_window": context_window},
-                timeout=API_TIMEOUT * 2  # Double timeout for message sending
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 2)  # Double timeout for message sending
             )
             if response.status_code == 200:
                 # Clear session cache
-                APIClient.get_chat_session.cache_clear()
+                APIClient.get_chat_session.invalidate(session_id)
                 return response.json()
             else:
                 st.error(f"Failed to send message: {response.status_code}")
@@ -225,37 +312,63 @@ class APIClient:
             return None
     
     @staticmethod
-    @st.cache_data(ttl=300)
+    @cache_success(ttl=CACHE_TTL, show_spinner=False)
     def get_documents() -> List[Dict[str, Any]]:
-        """Get all documents with caching."""
+        """Get all documents with caching; failures are not cached."""
         try:
             # Add include_metadata=true parameter to get complete document details
-            response = requests.get(
+            response = _SESSION.get(
                 APIClient.join_url("documents"),
                 params={"include_metadata": "true", "include_processing_info": "true"},
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             st.error(f"Error fetching documents: {str(e)}")
-            return []
+            raise _Uncached([])
+    
+    @staticmethod
+    def get_document_options() -> Dict[str, str]:
+        """Map document ids to display names for selection widgets.
+
+        Built from the cached get_documents list rather than cached itself,
+        so a failed fetch is retried instead of serving an empty map.
+        """
+        return {
+            doc["id"]: doc.get("original_filename", "Unnamed")
+            for doc in APIClient.get_documents() or []
+            if doc.get("id")
+        }
+    
+    @staticmethod
+    def invalidate_documents():
+        """Drop cached document lists after a change on the backend."""
+        APIClient.get_documents.clear()
+        APIClient.get_documents_by_ids.clear()
     
     @staticmethod
-    def upload_document(file_name: str, file_content: bytes, content_type: str = None) -> Dict[str, Any]:
-        """Upload a document file to the API."""
+    def upload_document(file_name: str, file_content: Union[bytes, BinaryIO], content_type: str = None) -> Dict[str, Any]:
+        """Upload a document file to the API.
+
+        file_content may be bytes or a binary file-like object (such as a
+        Streamlit UploadedFile), which requests reads itself when encoding.
+        """
         try:
+            if hasattr(file_content, "seek"):
+                file_content.seek(0)
             files = {
                 'file': (file_name, file_content, content_type)
             }
             
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url("documents/upload"),
                 files=files,
-                timeout=API_TIMEOUT * 2  # Longer timeout for uploads
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 2)  # Longer timeout for uploads
             )
             
             if response.status_code in (200, 201):
+                APIClient.invalidate_documents()
                 return {"success": True, "data": response.json()}
             else:
                 return {"success": False, "error": f"API error: {response.status_code} - {response.text}"}
@@ -263,48 +376,73 @@ class APIClient:
             return {"success": False, "error": str(e)}
     
     @staticmethod
-    def import_document_from_url(url: str) -> Dict[str, Any]:
-        """Import a document from a URL."""
+    def upload_documents_batch(payloads: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Upload several files in one multipart request.
+
+        Each payload holds upload_document's arguments. Returns one result per
+        payload, in order, shaped like upload_document's return value.
+        """
         try:
-            # Use the upload-by-path endpoint which accepts URLs as per backend code
-            response = requests.post(
-                APIClient.join_url("documents/upload"),
-                data={"file_url": url, "process_immediately": "true"},
-                timeout=API_TIMEOUT * 2  # Longer timeout for imports
+            files = []
+            for payload in payloads:
+                file_content = payload["file_content"]
+                if hasattr(file_content, "seek"):
+                    file_content.seek(0)
+                files.append(("files", (payload["file_name"], file_content, payload.get("content_type"))))
+            
+            response = _SESSION.post(
+                APIClient.join_url("documents/upload-multiple"),
+                files=files,
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 2)  # Longer timeout for uploads
             )
             
             if response.status_code in (200, 201):
-                return {"success": True, "data": response.json()}
-            else:
-                return {"success": False, "error": f"API error: {response.status_code} - {response.text}"}
+                APIClient.invalidate_documents()
+                return [
+                    {"success": False, "error": item.get("message", "Upload failed")}
+                    if item.get("status") == "failed" else {"success": True, "data": item}
+                    for item in response.json()
+                ]
+            error = f"API error: {response.status_code} - {response.text}"
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            error = str(e)
+        return [{"success": False, "error": error} for _ in payloads]
     
     @staticmethod
-    def import_document_from_path(path: str) -> Dict[str, Any]:
-        """Import a document from a server path."""
+    def _import_document(source_field: str, source: str) -> Dict[str, Any]:
+        """Ask the upload endpoint to fetch a document by URL or server path."""
         try:
-            # Use the upload endpoint with file_path parameter
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url("documents/upload"),
-                data={"file_path": path, "process_immediately": "true"},
-                timeout=API_TIMEOUT * 2  # Longer timeout for imports
+                data={source_field: source, "process_immediately": "true"},
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 2)  # Longer timeout for imports
             )
             
             if response.status_code in (200, 201):
+                APIClient.invalidate_documents()
                 return {"success": True, "data": response.json()}
             else:
                 return {"success": False, "error": f"API error: {response.status_code} - {response.text}"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def import_document_from_url(url: str) -> Dict[str, Any]:
+        """Import a document from a URL."""
+        return APIClient._import_document("file_url", url)
+    
+    @staticmethod
+    def import_document_from_path(path: str) -> Dict[str, Any]:
+        """Import a document from a server path."""
+        return APIClient._import_document("file_path", path)
+    
     @staticmethod
     def delete_document(document_id: str) -> Dict[str, Any]:
         """Delete a document from the system."""
         try:
-            response = requests.delete(
+            response = _SESSION.delete(
                 APIClient.join_url(f"documents/{document_id}"),
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             
             if response.status_code in (200, 204):
@@ -318,9 +456,9 @@ class APIClient:
     def reprocess_document(document_id: str) -> Dict[str, Any]:
         """Reprocess a document."""
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url(f"documents/{document_id}/reprocess"),
-                timeout=API_TIMEOUT
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
             
             if response.status_code in (200, 202):
@@ -331,24 +469,62 @@ class APIClient:
             return {"success": False, "error": str(e)}
     
     @staticmethod
-    def get_document_status(document_id: str) -> Dict[str, Any]:
-        """Get the current status of a document."""
+    def stream_document_events(document_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield a document's status updates as the server pushes them.
+
+        Reads the documents/{id}/events Server-Sent Events stream over one
+        connection until the server closes it, which it does once processing
+        has finished or failed. Keep-alive comments are yielded as None, so a
+        caller waiting on a quiet stream still gets control back regularly.
+        Request errors propagate to the caller.
+        """
+        with _SESSION.get(
+            APIClient.join_url(f"documents/{document_id}/events"),
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                # Blank lines only separate events
+                if line.startswith(b"data:"):
+                    yield json.loads(line[5:])
+                elif line.startswith(b":"):
+                    yield None
+    
+    @staticmethod
+    @cache_success(ttl=5, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+    def get_documents_by_ids(document_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several documents at once, keyed by document id.
+
+        Uses a single GET /documents?ids=... request. Documents that fail to
+        load are omitted. Results are memoized briefly so reruns don't repeat
+        the lookup.
+        """
+        if not document_ids:
+            return {}
+        wanted = set(document_ids)
         try:
-            response = requests.get(
-                APIClient.join_url(f"documents/{document_id}/status"),
-                timeout=API_TIMEOUT
+            response = _SESSION.get(
+                APIClient.join_url("documents"),
+                params={"ids": ",".join(document_ids)},
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)
             )
-            
-            if response.status_code == 200:
-                return {"success": True, "data": response.json()}
-            else:
-                return {"success": False, "error": f"API error: {response.status_code} - {response.text}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            raise _Uncached({})
+        # Filter client-side too, in case the server ignores the ids filter
+        return {doc["id"]: doc for doc in response.json() if doc.get("id") in wanted}
     
     @staticmethod
-    def semantic_search(query: str, doc_ids: List[str] = None, top_k: int = 10, threshold: float = 0.7) -> Dict[str, Any]:
-        """Perform semantic search on document embeddings."""
+    @cache_success(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+    def semantic_search(query: str, doc_ids: Sequence[str] = None, top_k: int = 10, threshold: float = 0.7) -> Dict[str, Any]:
+        """Perform semantic search on document embeddings.
+
+        Results are cached per (query, doc_ids, top_k, threshold); pass doc_ids
+        as a sorted tuple so the same selection always hits the same entry.
+        Failed searches are not cached.
+        """
         try:
             payload = {
                 "query": query,
@@ -358,17 +534,43 @@ class APIClient:
             
             # Add document IDs if specified
             if doc_ids:
-                payload["document_ids"] = doc_ids
+                payload["document_ids"] = list(doc_ids)
                 
             # The correct search endpoint path
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url("documents/search"),
                 json=payload,
-                timeout=API_TIMEOUT * 2  # Longer timeout for search
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 2)  # Longer timeout for search
             )
             
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
+            error = f"API error: {response.status_code} - {response.text}"
+        except Exception as e:
+            error = str(e)
+        raise _Uncached({"success": False, "error": error})
+    
+    @staticmethod
+    def search_document_batch(document_id: str, queries: Sequence[str], limit: int = 5) -> Dict[str, Any]:
+        """Search one document's embeddings with several queries in one request.
+
+        On success, data["results"] holds one result list per query, in order.
+        Repeated queries are sent once and their results shared.
+        """
+        try:
+            unique = list(dict.fromkeys(queries))
+            response = _SESSION.post(
+                APIClient.join_url(f"documents/{document_id}/embeddings/batch"),
+                json={"queries": unique, "limit": limit},
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 2)  # Longer timeout for search
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                # Scatter the unique results back to every original position
+                by_query = dict(zip(unique, data.get("results", [])))
+                data["results"] = [by_query.get(query, []) for query in queries]
+                return {"success": True, "data": data}
             else:
                 return {"success": False, "error": f"API error: {response.status_code} - {response.text}"}
         except Exception as e:
@@ -378,9 +580,9 @@ class APIClient:
     def generate_embeddings(document_id: str) -> Dict[str, Any]:
         """Generate embeddings for a document."""
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 APIClient.join_url(f"documents/{document_id}/embeddings"),
-                timeout=API_TIMEOUT * 3  # Even longer timeout for embedding generation
+                timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT * 3)  # Even longer timeout for embedding generation
             )
             
             if response.status_code in (200, 202):
@@ -34,14 +34,11 @@ def bare_bones_upload_page():
                     for file in uploaded_files:
                         try:
                             st.info(f"Processing: {file.name}")
-                            # Read file content
-                            file_content = file.read()
-                            file_name = file.name
                             
                             # Make the actual API call to upload the file
                             response = APIClient.upload_document(
-                                file_name=file_name,
-                                file_content=file_content,
+                                file_name=file.name,
+                                file_content=file,
                                 content_type=file.type
                             )
                             
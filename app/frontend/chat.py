@@ -9,22 +9,21 @@ import sys
 import threading
 import time
 import uuid
+from collections import deque
 from datetime import datetime
 from enum import Enum, auto
 from typing import Any, Dict, List, Optional, Union
-from urllib.parse import urljoin
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import requests
 import streamlit as st
 import websockets
-from PIL import Image
+from requests.adapters import HTTPAdapter
 
 from app.config.settings import settings
 from app.frontend.api import APIClient
 from app.frontend.components import Callbacks, SessionState, UIComponents
+from app.frontend.config import MAX_MESSAGES_PER_SESSION
+from app.frontend.utils import join_api_url, parse_iso_datetime
 
 # Initialize session state variables
 if "chat_sessions" not in st.session_state:
@@ -152,15 +151,16 @@ class ResponseAnalyzer:
 # Configuration
 API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000/api")
 
-# Ensure proper URL joining that preserves the /api path
-def join_api_url(base_url, path):
-    """Join API base URL with path, ensuring the /api part is preserved.
-    This handles the case where urllib.parse.urljoin might remove the /api path."""
-    # If the base URL doesn't end with a slash, and path starts with a slash,
-    # urljoin might discard the last path component of base_url
-    if not base_url.endswith('/'):
-        base_url = base_url + '/'
-    return urljoin(base_url, path.lstrip('/'))
+@st.cache_resource
+def get_http_session():
+    """Pooled HTTP session shared across reruns so calls reuse keep-alive connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+HTTP = get_http_session()
 
 # Initialize ResponseAnalyzer
 response_analyzer = ResponseAnalyzer()
@@ -169,8 +169,7 @@ response_analyzer = ResponseAnalyzer()
 def format_datetime(dt_str):
     """Format datetime string to human-readable format."""
     try:
-        dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        return parse_iso_datetime(dt_str).strftime("%Y-%m-%d %H:%M:%S")
     except:
         return dt_str
 
@@ -210,7 +209,7 @@ def check_api_health(base_url):
     """Check if the API is healthy - cached."""
     try:
         health_url = f"{base_url}/health"
-        api_check = requests.get(health_url, timeout=3)
+        api_check = HTTP.get(health_url, timeout=3)
         return api_check.status_code == 200
     except Exception as e:
         print(f"API Health Check Error: {e}")
@@ -228,7 +227,7 @@ def update_api_status():
         st.session_state.backend_issue = None
         try:
             test_sessions_url = join_api_url(API_BASE_URL, "/chat/sessions")
-            test_response = requests.get(test_sessions_url, timeout=5)
+            test_response = HTTP.get(test_sessions_url, timeout=5)
             if test_response.status_code == 500:
                 if "AttributeError: 'ChatService' object has no attribute 'get_sessions'" in test_response.text:
                     st.session_state.backend_issue = "missing_method"
@@ -377,7 +376,7 @@ def render_api_diagnostics():
         if st.button("Test Health", key="test_health"):
             try:
                 with st.spinner("Testing API health..."):
-                    response = requests.get(health_url, timeout=5)
+                    response = HTTP.get(health_url, timeout=5)
                     if response.status_code == 200:
                         st.success(f"✅ Health check passed: {response.status_code}")
                         st.json(response.json() if response.text else {})
@@ -397,7 +396,7 @@ def render_api_diagnostics():
         if st.button("Test Sessions", key="test_sessions"):
             try:
                 with st.spinner("Testing sessions endpoint..."):
-                    response = requests.get(sessions_url, timeout=5)
+                    response = HTTP.get(sessions_url, timeout=5)
                     if response.status_code == 200:
                         st.success(f"✅ Sessions endpoint working: {response.status_code}")
                         data = response.json()
@@ -420,7 +419,7 @@ def render_api_diagnostics():
         if st.button("Test Documents", key="test_docs"):
             try:
                 with st.spinner("Testing documents endpoint..."):
-                    response = requests.get(docs_url, timeout=5)
+                    response = HTTP.get(docs_url, timeout=5)
                     if response.status_code == 200:
                         st.success(f"✅ Documents endpoint working: {response.status_code}")
                         data = response.json()
@@ -447,13 +446,13 @@ def render_api_diagnostics():
         try:
             with st.spinner(f"Testing endpoint with {method}..."):
                 if method == "GET":
-                    response = requests.get(full_url, timeout=timeout)
+                    response = HTTP.get(full_url, timeout=timeout)
                 elif method == "POST":
-                    response = requests.post(full_url, timeout=timeout)
+                    response = HTTP.post(full_url, timeout=timeout)
                 elif method == "PUT":
-                    response = requests.put(full_url, timeout=timeout)
+                    response = HTTP.put(full_url, timeout=timeout)
                 elif method == "DELETE":
-                    response = requests.delete(full_url, timeout=timeout)
+                    response = HTTP.delete(full_url, timeout=timeout)
                 
                 st.text(f"Status Code: {response.status_code}")
                 try:
@@ -475,7 +474,7 @@ def get_documents():
             url = join_api_url(API_BASE_URL, "/documents")
             print(f"Fetching documents from: {url} (attempt {attempt}/{max_retries})")
             
-            response = requests.get(url, timeout=10)
+            response = HTTP.get(url, timeout=10)
             
             if response.status_code == 200:
                 documents = response.json()
@@ -545,7 +544,7 @@ def get_chat_sessions():
             print(f"Fetching chat sessions from: {url} (attempt {attempt}/{max_retries})")
             
             api_start_time = time.time() # Time the actual API call
-            response = requests.get(url, timeout=10) # Increased timeout slightly
+            response = HTTP.get(url, timeout=10) # Increased timeout slightly
             api_call_duration = time.time() - api_start_time
             print(f"API call took {api_call_duration:.4f}s")
             
@@ -702,7 +701,7 @@ def get_chat_session(session_id):
             print(f"Getting chat session from: {url} (attempt {attempt}/{max_retries})")
             
             api_start_time = time.time() # Time the API call
-            response = requests.get(url, timeout=5)
+            response = HTTP.get(url, timeout=5)
             api_call_duration = time.time() - api_start_time
             print(f"API call took {api_call_duration:.4f}s")
             
@@ -727,7 +726,7 @@ def get_chat_session(session_id):
                 if response.status_code == 404 and formatted_id != session_id:
                     backup_url = join_api_url(API_BASE_URL, f"/chat/sessions/{session_id}")
                     print(f"Got 404, trying fallback URL: {backup_url}")
-                    backup_response = requests.get(backup_url, timeout=5)
+                    backup_response = HTTP.get(backup_url, timeout=5)
                     
                     if backup_response.status_code == 200:
                         print("Fallback request succeeded")
@@ -862,7 +861,7 @@ def create_chat_session(document_id=None, document_ids=None, name=None, chat_mod
         print(f"Request headers: {{'Content-Type': 'application/json'}}")
         print(f"Request body: {json.dumps(payload)}")
         
-        response = requests.post(
+        response = HTTP.post(
             url,
             json=payload,
             timeout=10  # Add a timeout to avoid hanging indefinitely
@@ -884,12 +883,13 @@ def create_chat_session(document_id=None, document_ids=None, name=None, chat_mod
             st.error(error_msg)
             print(error_msg)
             
-            # Try to check if we can access the API at all
+            # Try to check if we can access the API at all; the health endpoint
+            # answers without transferring the whole session list
             try:
-                test_response = requests.get(join_api_url(API_BASE_URL, "/chat/sessions"), timeout=5)
+                test_response = HTTP.get(join_api_url(API_BASE_URL, "/health"), timeout=5)
                 print(f"Test API connection status: {test_response.status_code}")
                 if test_response.status_code != 200:
-                    print("API connection test failed - cannot access chat sessions endpoint")
+                    print("API connection test failed - cannot access health endpoint")
             except Exception as conn_err:
                 print(f"API connection test error: {str(conn_err)}")
             
@@ -905,7 +905,7 @@ def delete_chat_session(session_id):
     try:
         # Ensure ID is properly formatted
         formatted_id = format_uuid_if_needed(session_id)
-        response = requests.delete(join_api_url(API_BASE_URL, f"/chat/sessions/{formatted_id}"))
+        response = HTTP.delete(join_api_url(API_BASE_URL, f"/chat/sessions/{formatted_id}"), timeout=10)
         response.raise_for_status()
         # Clear the chat sessions cache to force refresh
         get_chat_sessions.clear()
@@ -930,7 +930,7 @@ def send_message(session_id, message, context_window=5):
         
         for attempt in range(1, max_retries + 1):
             try:
-                response = requests.post(
+                response = HTTP.post(
                     url,
                     params={"context_window": context_window},
                     json={"text": message},
@@ -1021,12 +1021,14 @@ def visualize_response(query, response_text, metadata=None):
     elif response_type == ResponseType.TABLE:
         # Try to extract and display a table
         try:
+            import pandas as pd  # Deferred: only table responses need it
+            
             # Convert visualization data to DataFrame if not already
             data = analysis["visualization_data"]
             if isinstance(data, pd.DataFrame):
                 df = data
             elif isinstance(data, dict) and "headers" in data and "data" in data:
-                df = pd.DataFrame(data["data"], columns=data["headers"])
+                df = pd.DataFrame.from_records(data["data"], columns=data["headers"])
             elif isinstance(data, dict):
                 df = pd.DataFrame(data)
             else:
@@ -1053,6 +1055,8 @@ def visualize_response(query, response_text, metadata=None):
             data = analysis["visualization_data"]
             
             if isinstance(data, dict) and "labels" in data and "values" in data:
+                import plotly.express as px  # Deferred: only chart responses need it
+                
                 # Simple chart data
                 labels = data["labels"]
                 values = data["values"]
@@ -1090,6 +1094,20 @@ def visualize_response(query, response_text, metadata=None):
         # For other types, just display the text
         st.markdown(response_text)
 
+# Metadata fields listed under a search result's source information, in order
+SOURCE_INFO_FIELDS = (
+    ("page_number", "Page"),
+    ("section_title", "Section"),
+    ("document_title", "Document"),
+)
+
+def source_info_markdown(metadata):
+    """Format a search result's metadata as a markdown bullet list."""
+    lines = [f"- {label}: {metadata[key]}" for key, label in SOURCE_INFO_FIELDS if metadata.get(key)]
+    if metadata.get("is_table"):
+        lines.append("- Content Type: Table")
+    return "\n".join(lines)
+
 @st.cache_data
 def visualize_search_results(results):
     """
@@ -1102,6 +1120,8 @@ def visualize_search_results(results):
         st.info("No search results found.")
         return
     
+    import plotly.express as px  # Deferred to keep plotly out of page startup
+    
     st.markdown("### Search Results")
     
     # Show relevance scores in a chart
@@ -1119,31 +1139,19 @@ def visualize_search_results(results):
     )
     st.plotly_chart(fig, use_container_width=True)
     
+    # Build each result's source lines up front so the render loop only emits
+    source_texts = [source_info_markdown(result.get("metadata") or {}) for result in results]
+    
     # Display individual results
-    for i, result in enumerate(results):
-        with st.expander(f"Result {i+1} - Relevance: {scores[i]:.4f}"):
+    for i, (result, score, source_text) in enumerate(zip(results, scores, source_texts)):
+        with st.expander(f"Result {i+1} - Relevance: {score:.4f}"):
             text = result.get("text", "").strip()
             st.markdown(text)
             
             # Show metadata if available
-            metadata = result.get("metadata", {})
-            if metadata:
+            if result.get("metadata"):
                 st.markdown("**Source Information:**")
-                meta_text = ""
-                
-                if metadata.get("page_number"):
-                    meta_text += f"- Page: {metadata['page_number']}\n"
-                    
-                if metadata.get("section_title"):
-                    meta_text += f"- Section: {metadata['section_title']}\n"
-                    
-                if metadata.get("document_title"):
-                    meta_text += f"- Document: {metadata['document_title']}\n"
-                    
-                if metadata.get("is_table"):
-                    meta_text += f"- Content Type: Table\n"
-                
-                st.markdown(meta_text)
+                st.markdown(source_text)
 
 @st.cache_data
 def is_valid_uuid(val):
@@ -1189,8 +1197,9 @@ async def connect_websocket(session_id):
     try:
         connection = await websockets.connect(ws_url)
         # Store session data
+        # Bounded, so a long-lived connection can't grow session state forever
         if session_id not in st.session_state.ws_messages:
-            st.session_state.ws_messages[session_id] = []
+            st.session_state.ws_messages[session_id] = deque(maxlen=MAX_MESSAGES_PER_SESSION)
         return connection
     except Exception as e:
         print(f"Error connecting to WebSocket: {str(e)}")
@@ -1378,11 +1387,13 @@ def create_direct_chat_session(key_prefix="main_create"):
                             f"Document {doc['id'][:8]}"
                 doc_options.append({"id": doc["id"], "name": doc_title})
             doc_options.sort(key=lambda x: x["name"])
+            # format_func runs once per option; options are exactly these keys
+            doc_names = {doc["id"]: doc["name"] for doc in doc_options}
 
             st.multiselect(
                 "Select Documents",
-                options=[doc["id"] for doc in doc_options],
-                format_func=lambda doc_id: next((doc["name"] for doc in doc_options if doc["id"] == doc_id), doc_id),
+                options=list(doc_names),
+                format_func=doc_names.get,
                 key=f"{key_prefix}_docs"
             )
         else:
@@ -1442,7 +1453,7 @@ def reset_all_chat_sessions():
     """Reset all chat sessions - use with caution!"""
     try:
         url = join_api_url(API_BASE_URL, "/chat/sessions")
-        response = requests.delete(url, timeout=5)
+        response = HTTP.delete(url, timeout=5)
         
         if response.status_code == 200:
             # Clear caches
@@ -1467,7 +1478,7 @@ def render_session_selector():
         sessions = get_chat_sessions()
         if sessions:
             try:
-                sessions.sort(key=lambda s: datetime.fromisoformat(s.get('updated_at', '1970-01-01T00:00:00+00:00').replace('Z', '+00:00')), reverse=True)
+                sessions.sort(key=lambda s: parse_iso_datetime(s.get('updated_at', '1970-01-01T00:00:00+00:00')), reverse=True)
             except Exception as e:
                 print(f"Error sorting sessions by date: {e}")
             st.session_state.chat_sessions = sessions
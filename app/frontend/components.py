@@ -1,8 +1,9 @@
 import time
+from collections import defaultdict
 from datetime import datetime
+from html import escape
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
 import streamlit as st
 
 from app.frontend.api import APIClient
@@ -19,7 +20,45 @@ from app.frontend.forms import Forms
 from app.frontend.response_analyzer import ResponseAnalyzer, ResponseType
 from app.frontend.state import SessionState
 from app.frontend.upload import UploadManager
-from app.frontend.utils import format_datetime, format_file_size, truncate_text
+from app.frontend.utils import (
+    format_datetime,
+    format_file_size,
+    normalize_query,
+    parse_iso_datetime,
+    truncate_text,
+)
+
+
+# Repeat submissions of the same search within this window reuse the last results
+_SEARCH_DEBOUNCE_SECONDS = 0.3
+
+# Longest a document manager run follows a status stream before rerunning
+_STATUS_STREAM_SECONDS = 10
+
+# How often the embeddings panel re-polls while any embedding is in flight
+_EMBEDDING_POLL_SECONDS = 5
+
+# Polls in a row without any embedding progress before the panel stops polling
+_EMBEDDING_POLL_MAX_IDLE = 12
+
+# Larger result sets default to a single table instead of one block per document
+_DETAILED_RESULTS_LIMIT = 20
+
+# st.fragment arrived in Streamlit 1.33 (experimental_fragment before 1.37);
+# on older releases the decorated function simply runs with the full page
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+def _progress_fraction(value: Any) -> float:
+    """A document's processing_progress as a 0-1 fraction.
+
+    The API reports progress as a 0-1 fraction in both the document list and
+    the status stream; None or malformed values count as no progress.
+    """
+    try:
+        return max(0.0, min(1.0, float(value or 0)))
+    except (ValueError, TypeError):
+        return 0.0
 
 
 class UIComponents:
@@ -30,8 +69,7 @@ class UIComponents:
     def format_datetime(dt_str: str) -> str:
         """Format datetime string with caching."""
         try:
-            dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
+            return parse_iso_datetime(dt_str).strftime("%Y-%m-%d %H:%M:%S")
         except:
             return dt_str
 
@@ -43,8 +81,8 @@ class UIComponents:
             sessions = APIClient.get_chat_sessions()
             if sessions:
                 try:
-                    sessions.sort(key=lambda s: datetime.fromisoformat(
-                        s.get('updated_at', '1970-01-01T00:00:00+00:00').replace('Z', '+00:00')
+                    sessions.sort(key=lambda s: parse_iso_datetime(
+                        s.get('updated_at', '1970-01-01T00:00:00+00:00')
                     ), reverse=True)
                 except Exception as e:
                     print(f"Error sorting sessions: {e}")
@@ -217,21 +255,13 @@ class UIComponents:
                 st.rerun()
         with col2:
             if st.button("🔄 Refresh", key="refresh_chats", use_container_width=True):
-                st.cache_data.clear()
-                try:
-                    APIClient.get_chat_sessions.clear()
-                except:
-                    pass
+                APIClient.get_chat_sessions.cache_clear()
                 st.rerun()
         
         # Try to fetch sessions with cache cleared
         with st.spinner("Loading chat sessions..."):
             try:
-                st.cache_data.clear()
-                try:
-                    APIClient.get_chat_sessions.clear()
-                except:
-                    pass
+                APIClient.get_chat_sessions.cache_clear()
                 sessions = APIClient.get_chat_sessions()
             except Exception as e:
                 st.error(f"Error loading chat sessions: {str(e)}")
@@ -249,12 +279,16 @@ class UIComponents:
             session_id = session.get("id", "")
             session_name = session.get("name", "Unnamed Session")
             
+            # Escape user-supplied values before interpolating them into HTML
+            safe_name = escape(session_name or "")
+            safe_date = escape(format_datetime(session.get('created_at', '')) or "")
+            
             # Use HTML for more compact session cards
             st.markdown(f"""
             <div class='compact-card'>
                 <div class="session-card">
-                    <p class="session-title">{session_name}</p>
-                    <p class="session-date">Created: {format_datetime(session.get('created_at', ''))}</p>
+                    <p class="session-title">{safe_name}</p>
+                    <p class="session-date">Created: {safe_date}</p>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -349,12 +383,6 @@ class UIComponents:
                         result = APIClient.rename_chat_session(renaming_session_id, new_name)
                         if result:
                             st.success(f"Session renamed to '{new_name}'.")
-                            # Clear cache and refresh list
-                            st.cache_data.clear()
-                            try:
-                                APIClient.get_chat_sessions.clear()
-                            except:
-                                pass
                         else:
                             st.error(f"Failed to rename session to '{new_name}'.")
                         
@@ -383,6 +411,8 @@ class UIComponents:
     @staticmethod
     def render_document_manager():
         """Render the document manager interface."""
+        import pandas as pd  # Imported lazily; only the document views need it
+        
         st.title("📄 Document Manager")
         
         # Document list
@@ -393,9 +423,7 @@ class UIComponents:
         
         # Handle potential None response from API safely
         try:
-            documents = APIClient.get_documents()
-            if documents is None:
-                documents = []  # Ensure documents is a list even if API returns None
+            documents = APIClient.get_documents() or []
         except Exception as e:
             st.error(f"Error fetching documents: {str(e)}")
             documents = []
@@ -411,31 +439,62 @@ class UIComponents:
                 if not st.session_state.get('processing_complete', False):
                     with st.spinner("Processing documents..."):
                         # Display each processing document
+                        status_lines = {}
+                        status_lines_text = {}
+                        progress_values = {}
                         for doc in processing_docs:
                             doc_name = doc.get("original_filename", "Unnamed document")
                             doc_status = doc.get("status", "Unknown")
-                            doc_progress = doc.get("processing_progress", 0)
+                            progress_value = _progress_fraction(doc.get("processing_progress"))
                             
-                            # Handle potential None or invalid progress values
-                            try:
-                                progress_value = float(doc_progress) / 100 if doc_progress is not None else 0
-                                progress_value = max(0, min(1, progress_value))  # Clamp between 0 and 1
-                            except (ValueError, TypeError):
-                                progress_value = 0
-                                
-                            st.text(f"Processing: {doc_name} - {doc_status} ({int(progress_value * 100)}%)")
+                            status_lines_text[doc.get("id")] = f"Processing: {doc_name} - {doc_status} ({int(progress_value * 100)}%)"
+                            status_lines[doc.get("id")] = st.empty()
+                            status_lines[doc.get("id")].text(status_lines_text[doc.get("id")])
+                            progress_values[doc.get("id")] = progress_value
                             
                         # Set overall progress to average of all documents
-                        overall_progress = sum(float(doc.get("processing_progress", 0) or 0) for doc in processing_docs) / len(processing_docs) / 100
+                        overall_progress = sum(progress_values.values()) / len(progress_values)
                         progress_bar.progress(overall_progress)
                         
-                        # Auto-refresh every 3 seconds if documents are still processing
-                        if overall_progress < 1.0:
+                        # Follow one document's status stream instead of re-polling
+                        # the whole list. The stream is capped per run, so other
+                        # documents' rows are refreshed by the rerun and a stuck
+                        # job never holds the page
+                        doc = processing_docs[0]
+                        doc_id = doc.get("id")
+                        doc_name = doc.get("original_filename", "Unnamed document")
+                        finished = False
+                        deadline = time.monotonic() + _STATUS_STREAM_SECONDS
+                        try:
+                            for event in APIClient.stream_document_events(doc_id):
+                                if event is None:
+                                    # Keep-alive: redraw the line so Streamlit can act
+                                    # on a pending rerun or navigation request
+                                    status_lines[doc_id].text(status_lines_text[doc_id])
+                                else:
+                                    progress_value = _progress_fraction(event.get("processing_progress"))
+                                    progress_values[doc_id] = progress_value
+                                    status_lines_text[doc_id] = (
+                                        f"Processing: {doc_name} - {event.get('status', 'Unknown')} ({int(progress_value * 100)}%)"
+                                    )
+                                    status_lines[doc_id].text(status_lines_text[doc_id])
+                                    progress_bar.progress(sum(progress_values.values()) / len(progress_values))
+                                if time.monotonic() >= deadline:
+                                    break
+                            else:
+                                # The server closes the stream once the document is done
+                                finished = True
+                        except Exception as e:
+                            # Streaming unavailable; fall back to a timed refresh
+                            print(f"Status stream unavailable, polling instead: {e}")
                             time.sleep(3)
-                            st.rerun()
-                        else:
-                            st.session_state['processing_complete'] = True
-                            st.success("All documents processed successfully!")
+                        
+                        if finished and len(processing_docs) == 1:
+                            st.session_state['processing_notice'] = True
+                        APIClient.invalidate_documents()
+                        st.rerun()
+        elif st.session_state.pop('processing_notice', False):
+            progress_container.success("All documents processed successfully!")
         
         if not documents:
             st.info("No documents found. Upload some documents to get started!")
@@ -448,20 +507,20 @@ class UIComponents:
         # Create a dataframe for better display
         docs_data = []
         for doc in documents:
+            g = doc.get  # Bound once; the row below reads many fields
+            
             # Extract metadata properly with better fallbacks
-            metadata = doc.get("metadata", {}) or {}
+            metadata = g("metadata", {}) or {}
             
             # Get file size - check multiple possible locations
-            file_size = metadata.get("size", 0)
-            if not file_size and "file_size" in doc:
-                file_size = doc.get("file_size", 0)
+            file_size = metadata.get("size", 0) or g("file_size", 0)
             
             # Get processing status - map status to human-readable format
-            doc_status = doc.get("status", "Unknown")
+            doc_status = g("status", "Unknown")
             
             # Get processing steps to determine detailed status
-            processing_steps = doc.get("processing_steps", [])
-            processing_progress = doc.get("processing_progress", 0)
+            processing_steps = g("processing_steps", [])
+            processing_progress = _progress_fraction(g("processing_progress")) * 100
             if not processing_progress and processing_steps:
                 # Calculate progress from steps if available
                 completed_steps = sum(1 for step in processing_steps if step.get("status") == "completed")
@@ -489,31 +548,26 @@ class UIComponents:
                 elif doc_status == "failed":
                     processing_status = "Failed"
                 else:
-                    processing_status = doc.get("processing_status", doc_status.title())
+                    processing_status = g("processing_status", doc_status.title())
             
             # Get embedding status
-            embedding_status = doc.get("embedding_status", "Not Started")
+            embedding_status = g("embedding_status", "Not Started")
             if embedding_status == "completed":
                 embedding_status = "Completed"
             elif embedding_status == "processing":
-                embedding_progress = doc.get("embedding_progress", 0)
-                embedding_status = f"Processing ({int(embedding_progress)}%)"
-            
-            # Get timestamps and ensure they're not None
-            created_at = doc.get("created_at", "")
-            updated_at = doc.get("updated_at", "")
+                embedding_status = f"Processing ({int(g('embedding_progress', 0))}%)"
             
             # Add document data to the list with safe values
             docs_data.append({
-                "Name": doc.get("original_filename", "Unnamed") or "Unnamed",
+                "Name": g("original_filename", "Unnamed") or "Unnamed",
                 "Type": metadata.get("mime_type", metadata.get("type", "Unknown")) or "Unknown",
                 "Size": format_file_size(file_size),
                 "Status": doc_status.title(),
                 "Processing": processing_status,
                 "Embedding": embedding_status,
-                "Created": format_datetime(created_at),
-                "Updated": format_datetime(updated_at),
-                "Actions": doc.get("id", ""),
+                "Created": format_datetime(g("created_at", "")),
+                "Updated": format_datetime(g("updated_at", "")),
+                "Actions": g("id", ""),
                 # Store the full document object for viewing
                 "FullDocument": doc  
             })
@@ -575,6 +629,7 @@ class UIComponents:
                     ):
                         try:
                             APIClient.delete_document(doc['Actions'])
+                            APIClient.invalidate_documents()
                             st.success(f"Document {doc['Name']} deleted")
                             st.rerun()
                         except Exception as e:
@@ -590,6 +645,7 @@ class UIComponents:
                             # Reset processing state on reprocess
                             st.session_state['processing_complete'] = False
                             APIClient.reprocess_document(doc['Actions'])
+                            APIClient.invalidate_documents()
                             st.success(f"Document {doc['Name']} queued for reprocessing")
                             st.rerun()
                         except Exception as e:
@@ -614,7 +670,7 @@ class UIComponents:
                 with col2:
                     st.markdown("### Processing Information")
                     st.markdown(f"**Status:** {viewing_doc.get('status', 'Unknown').title()}")
-                    st.markdown(f"**Processing Progress:** {viewing_doc.get('processing_progress', 0)}%")
+                    st.markdown(f"**Processing Progress:** {int(_progress_fraction(viewing_doc.get('processing_progress')) * 100)}%")
                     
                     # Display embedding information
                     embedding_status = viewing_doc.get('embedding_status', 'Not Started')
@@ -657,16 +713,8 @@ class UIComponents:
             if st.button("🔄 Refresh List", use_container_width=True):
                 # Reset processing state on refresh
                 st.session_state['processing_complete'] = False
-                # Clear all related caches
-                st.cache_data.clear()
-                try:
-                    # Try all possible cache clear methods to ensure fresh data
-                    if hasattr(APIClient.get_documents, 'clear'):
-                        APIClient.get_documents.clear()
-                    if hasattr(APIClient.get_documents, 'cache_clear'):
-                        APIClient.get_documents.cache_clear()
-                except Exception as e:
-                    st.error(f"Error clearing cache: {str(e)}")
+                # Clear only the document caches to ensure fresh data
+                APIClient.invalidate_documents()
                 # Force a rerun to fetch fresh data
                 st.rerun()
 
@@ -675,6 +723,10 @@ class UIComponents:
         """Render the search and embeddings interface."""
         st.title("🔍 Search & Embeddings")
         
+        # Messages queued before a rerun are shown without blocking the script
+        if flash := st.session_state.pop("_flash", None):
+            st.toast(flash, icon=ICONS["success"])
+        
         # Search section
         st.subheader("Semantic Search")
         with st.form(key="search_form"):
@@ -683,19 +735,25 @@ class UIComponents:
                 placeholder="Enter your search query...",
                 help="Use natural language to search across your documents"
             )
+            multi_query = st.checkbox(
+                "One query per line",
+                help="Search a single selected document with each line as its own query, in one request"
+            )
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
-                # Get documents with cache cleared
                 try:
-                    st.cache_data.clear()
-                    documents = APIClient.get_documents()
+                    documents = APIClient.get_documents() or []
+                    doc_labels = APIClient.get_document_options()
                 except:
                     documents = []
+                    doc_labels = {}
                 
-                selected_docs = st.multiselect(
+                # Options are plain ids, so widget state never hashes document dicts,
+                # and every option has a label, so the bound dict.get is enough
+                selected_ids = st.multiselect(
                     "Search in Documents",
-                    options=documents,
-                    format_func=lambda x: x.get("original_filename", "Unnamed"),
+                    options=list(doc_labels),
+                    format_func=doc_labels.get,
                     help="Select documents to search in (optional)"
                 )
             with col2:
@@ -720,54 +778,70 @@ class UIComponents:
                 use_container_width=True
             )
             
-            if submitted and query:
+            raw_query = query or ""
+            # Queries differing only in spacing map to the same cached search
+            query = normalize_query(raw_query)
+            if submitted and multi_query:
+                # Several queries against one document go out as a single batch
+                queries = [line for line in map(normalize_query, raw_query.splitlines()) if line]
+                if len(selected_ids) != 1:
+                    st.warning("Select exactly one document to search with one query per line.")
+                elif queries:
+                    with st.spinner(f"Searching with {len(queries)} queries..."):
+                        # Replace any single-query results on screen
+                        st.session_state.pop("_last_search_key", None)
+                        st.session_state["_last_search_results"] = None
+                        st.session_state["_last_batch_search"] = (
+                            queries,
+                            APIClient.search_document_batch(selected_ids[0], queries, limit=top_k)
+                        )
+            elif submitted and query:
+                st.session_state.pop("_last_batch_search", None)
                 with st.spinner("Searching..."):
-                    # Get selected document IDs
-                    doc_ids = [doc.get("id") for doc in selected_docs] if selected_docs else None
+                    # Get selected document IDs as a stable, hashable cache key
+                    doc_ids = tuple(sorted(selected_ids)) if selected_ids else None
                     
-                    # Perform the search
-                    search_results = APIClient.semantic_search(
-                        query=query,
-                        doc_ids=doc_ids,
-                        top_k=top_k,
-                        threshold=threshold
-                    )
+                    # Collapse rapid duplicate submissions into a single search
+                    search_key = (query, doc_ids, top_k, threshold)
+                    now = time.monotonic()
+                    last_search_ts = st.session_state.get("_last_search_ts", 0)
+                    if (
+                        now - last_search_ts < _SEARCH_DEBOUNCE_SECONDS
+                        and st.session_state.get("_last_search_key") == search_key
+                    ):
+                        search_results = st.session_state["_last_search_results"]
+                    else:
+                        # Perform the search
+                        search_results = APIClient.semantic_search(
+                            query=query,
+                            doc_ids=doc_ids,
+                            top_k=top_k,
+                            threshold=threshold
+                        )
+                        st.session_state["_last_search_key"] = search_key
+                        st.session_state["_last_search_results"] = search_results
+                    st.session_state["_last_search_ts"] = now
                     
+                    # Resolve every referenced document once, up front, so
+                    # "View Document" is a dict lookup rather than a fetch
                     if search_results.get("success"):
                         results = search_results.get("data", {}).get("results", [])
-                        
-                        if results:
-                            st.success(f"Found {len(results)} results")
-                            
-                            # Display search results
-                            for i, result in enumerate(results):
-                                with st.container():
-                                    col1, col2 = st.columns([4, 1])
-                                    with col1:
-                                        st.markdown(f"### {i+1}. {result.get('document_name', 'Unknown document')}")
-                                        st.markdown(f"**Score:** {result.get('score', 0):.2f}")
-                                        st.markdown(f"**Chunk:** {result.get('chunk_id', 'Unknown chunk')}")
-                                        st.markdown(f"**Text:**")
-                                        st.markdown(f"> {result.get('text', 'No text available')}")
-                                    with col2:
-                                        if st.button("View Document", key=f"view_result_{i}"):
-                                            # Get document details and view it
-                                            doc_id = result.get("document_id")
-                                            if doc_id:
-                                                # Redirect to document viewer
-                                                pass
-                        else:
-                            st.warning("No results found matching your query.")
-                    else:
-                        st.error(f"Search failed: {search_results.get('error', 'Unknown error')}")
+                        result_ids = {r.get("document_id") for r in results if r.get("document_id")}
+                        known = {d.get("id"): d for d in documents}
+                        doc_cache = {doc_id: known[doc_id] for doc_id in result_ids if doc_id in known}
+                        missing = [doc_id for doc_id in result_ids if doc_id not in doc_cache]
+                        if missing:
+                            doc_cache.update(APIClient.get_documents_by_ids(sorted(missing)))
+                        st.session_state["_result_doc_cache"] = doc_cache
+        
+        # Results are rendered outside the form so "View Document" can be a real button
+        UIComponents.render_search_results()
         
         # Embeddings section
         st.subheader("Document Embeddings")
         with st.expander("Manage Embeddings", expanded=True):
-            # Clear cache to get fresh data
             try:
-                st.cache_data.clear()
-                documents = APIClient.get_documents()
+                documents = APIClient.get_documents() or []
             except:
                 documents = []
                 
@@ -777,120 +851,276 @@ class UIComponents:
             
             # Add a button to refresh embedding status
             if st.button("🔄 Refresh Embedding Status", key="refresh_embeddings"):
-                st.cache_data.clear()
-                try:
-                    APIClient.get_documents.clear()
-                except:
-                    pass
+                st.session_state.pop("_embedding_poll_idle", None)
+                APIClient.invalidate_documents()
+                APIClient.semantic_search.clear()
                 st.rerun()
                 
-            for doc in documents:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    doc_name = doc.get("original_filename", "Unnamed")
-                    st.write(f"**{doc_name}**")
+            # Rows still needing attention are always shown; completed ones
+            # are only rendered on request to keep the widget count down
+            pending, done = [], []
+            for d in documents:
+                (done if d.get("embedding_status") == "completed" else pending).append(d)
+            
+            for doc in pending:
+                UIComponents.render_embedding_row(doc)
+            
+            if done and st.checkbox(f"Show completed ({len(done)})", key="show_done_embeddings"):
+                for doc in done:
+                    UIComponents.render_embedding_row(doc)
+            
+            # Keep polling only while an embedding is still in flight, and give
+            # up once nothing has changed for a while so a stuck job can't keep
+            # the page rerunning forever
+            in_flight = tuple(
+                (d.get("id"), d.get("embedding_progress"))
+                for d in documents if d.get("embedding_status") == "processing"
+            )
+            if in_flight:
+                idle_polls = st.session_state.get("_embedding_poll_idle", 0)
+                if in_flight == st.session_state.get("_embedding_poll_state"):
+                    idle_polls += 1
+                else:
+                    idle_polls = 0
+                st.session_state["_embedding_poll_state"] = in_flight
+                st.session_state["_embedding_poll_idle"] = idle_polls
+                
+                if idle_polls >= _EMBEDDING_POLL_MAX_IDLE:
+                    st.caption("Embedding progress hasn't changed lately; use Refresh Embedding Status to check again.")
+                else:
+                    # Wait in one-second steps, redrawing the caption each time, so a
+                    # click or navigation cuts the wait short instead of queuing behind it
+                    countdown = st.empty()
+                    for remaining in range(_EMBEDDING_POLL_SECONDS, 0, -1):
+                        countdown.caption(f"Embeddings in progress, refreshing in {remaining}s...")
+                        time.sleep(1)
+                    APIClient.invalidate_documents()
+                    st.rerun()
+
+    @staticmethod
+    @_fragment
+    def render_search_results():
+        """Render the last search's results.
+
+        Runs as a fragment where Streamlit supports it, so toggling the view
+        reruns only this block rather than the whole search page.
+        """
+        batch_search = st.session_state.get("_last_batch_search")
+        if batch_search:
+            UIComponents.render_batch_search_results(*batch_search)
+        
+        search_results = st.session_state.get("_last_search_results")
+        if search_results:
+            if search_results.get("success"):
+                results = search_results.get("data", {}).get("results", [])
+                doc_cache = st.session_state.get("_result_doc_cache", {})
+                
+                if results:
+                    # Group chunks by document and rank documents by their best chunk
+                    grouped = defaultdict(list)
+                    for result in results:
+                        grouped[result.get("document_id")].append(result)
+                    for chunks in grouped.values():
+                        chunks.sort(key=lambda r: r.get("score", 0), reverse=True)
+                    ranked = sorted(
+                        grouped.items(),
+                        key=lambda item: max(r.get("score", 0) for r in item[1]),
+                        reverse=True
+                    )
                     
-                    # Get embedding status
-                    embedding_status = doc.get("embedding_status", "not_started")
-                    if embedding_status == "completed":
-                        st.success("✅ Embedded")
-                    elif embedding_status == "processing":
-                        progress = doc.get("embedding_progress", 0)
-                        st.info(f"⏳ Embedding in progress ({progress}%)")
-                    elif embedding_status == "failed":
-                        st.error("❌ Embedding failed")
-                    else:
-                        st.warning("⏸️ Not embedded")
-                with col2:
-                    doc_id = doc.get("id")
-                    if doc_id:
-                        if embedding_status not in ["completed", "processing"]:
-                            if st.button(
-                                "Generate Embeddings",
-                                key=f"embed_{doc_id}",
-                                use_container_width=True
-                            ):
-                                with st.spinner(f"Generating embeddings for {doc_name}..."):
-                                    result = APIClient.generate_embeddings(doc_id)
-                                    if result.get("success"):
-                                        st.success(f"Started embedding generation for {doc_name}")
-                                        time.sleep(1)  # Short delay to show the message
-                                        st.rerun()  # Refresh to show updated status
-                                    else:
-                                        st.error(f"Failed to generate embeddings: {result.get('error', 'Unknown error')}")
-                        elif embedding_status == "completed":
-                            if st.button(
-                                "Regenerate",
-                                key=f"reembed_{doc_id}",
-                                use_container_width=True,
-                                type="secondary"
-                            ):
-                                with st.spinner(f"Regenerating embeddings for {doc_name}..."):
-                                    result = APIClient.generate_embeddings(doc_id)
-                                    if result.get("success"):
-                                        st.success(f"Started embedding regeneration for {doc_name}")
-                                        time.sleep(1)  # Short delay to show the message
-                                        st.rerun()  # Refresh to show updated status
-                                    else:
-                                        st.error(f"Failed to regenerate embeddings: {result.get('error', 'Unknown error')}")
-                        elif embedding_status == "processing":
-                            st.button(
-                                "Processing...",
-                                key=f"processing_{doc_id}",
-                                use_container_width=True,
-                                disabled=True
-                            )
-                    else:
-                        st.button(
-                            "No Document ID",
-                            key=f"no_id_{doc.get('original_filename', 'doc')}",
-                            use_container_width=True,
-                            disabled=True
+                    st.success(f"Found {len(results)} results in {len(ranked)} documents")
+                    
+                    detailed = st.toggle(
+                        "Detailed view",
+                        value=len(results) <= _DETAILED_RESULTS_LIMIT,
+                        help="Show each document with its chunks and actions instead of one table"
+                    )
+                    if not detailed:
+                        import pandas as pd
+                        
+                        # One frame, built column-wise, serialized once
+                        rows = [r for _, chunks in ranked for r in chunks]
+                        st.dataframe(
+                            pd.DataFrame({
+                                "Document": [r.get("document_name", "Unknown document") for r in rows],
+                                "Score": [r.get("score", 0) for r in rows],
+                                "Chunk": [r.get("chunk_id", "Unknown chunk") for r in rows],
+                                "Text": [r.get("text", "No text available") for r in rows]
+                            }),
+                            column_config={
+                                "Score": st.column_config.NumberColumn("Score", format="%.2f")
+                            },
+                            hide_index=True,
+                            use_container_width=True
                         )
+                    else:
+                        # Display one entry per document with its matching chunks nested
+                        for i, (doc_id, chunks) in enumerate(ranked):
+                            with st.container():
+                                col1, col2 = st.columns([4, 1])
+                                with col1:
+                                    st.markdown(f"### {i+1}. {chunks[0].get('document_name', 'Unknown document')}")
+                                    st.markdown(f"**Best Score:** {chunks[0].get('score', 0):.2f}")
+                                    with st.expander(f"{len(chunks)} matching chunk(s)", expanded=i == 0):
+                                        for result in chunks:
+                                            st.markdown(f"**Chunk:** {result.get('chunk_id', 'Unknown chunk')} (score {result.get('score', 0):.2f})")
+                                            st.markdown(f"> {result.get('text', 'No text available')}")
+                                with col2:
+                                    doc = doc_cache.get(doc_id)
+                                    if st.button("View Document", key=f"view_result_{i}", disabled=doc is None):
+                                        # Open the document in the document manager's viewer
+                                        SessionState.set("viewing_document", doc)
+                                        SessionState.set("current_view", "documents")
+                                        st.rerun()
+                else:
+                    st.warning("No results found matching your query.")
+            else:
+                st.error(f"Search failed: {search_results.get('error', 'Unknown error')}")
+
+    @staticmethod
+    def render_batch_search_results(queries: List[str], batch_results: Dict[str, Any]):
+        """Render a multi-query search as one expander of matching chunks per query."""
+        if not batch_results.get("success"):
+            st.error(f"Search failed: {batch_results.get('error', 'Unknown error')}")
+            return
+        
+        per_query = batch_results.get("data", {}).get("results", [])
+        for i, (query, results) in enumerate(zip(queries, per_query)):
+            with st.expander(f"{query} ({len(results)} results)", expanded=i == 0):
+                if not results:
+                    st.warning("No results found matching this query.")
+                for result in results:
+                    page = (result.get("metadata") or {}).get("page_number")
+                    distance = result.get("distance")
+                    details = [f"page {page}"] if page is not None else []
+                    if distance is not None:
+                        details.append(f"distance {distance:.2f}")
+                    suffix = f" ({', '.join(details)})" if details else ""
+                    st.markdown(f"**Chunk:** {result.get('id', 'Unknown chunk')}{suffix}")
+                    st.markdown(f"> {result.get('text', 'No text available')}")
+
+    @staticmethod
+    def render_embedding_row(doc: Dict[str, Any]):
+        """Render one document's embedding status and actions."""
+        g = doc.get
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            doc_name = g("original_filename", "Unnamed")
+            st.write(f"**{doc_name}**")
+            
+            # Get embedding status
+            embedding_status = g("embedding_status", "not_started")
+            if embedding_status == "completed":
+                st.success("✅ Embedded")
+            elif embedding_status == "processing":
+                progress = g("embedding_progress", 0)
+                st.info(f"⏳ Embedding in progress ({progress}%)")
+            elif embedding_status == "failed":
+                st.error("❌ Embedding failed")
+            else:
+                st.warning("⏸️ Not embedded")
+        with col2:
+            doc_id = g("id")
+            if doc_id:
+                if embedding_status not in ["completed", "processing"]:
+                    if st.button(
+                        "Generate Embeddings",
+                        key=f"embed_{doc_id}",
+                        use_container_width=True
+                    ):
+                        with st.spinner(f"Generating embeddings for {doc_name}..."):
+                            result = APIClient.generate_embeddings(doc_id)
+                            if result.get("success"):
+                                APIClient.invalidate_documents()
+                                # Shown by render_search_page after the rerun
+                                st.session_state["_flash"] = f"Started embedding generation for {doc_name}"
+                                st.rerun()  # Refresh to show updated status
+                            else:
+                                st.error(f"Failed to generate embeddings: {result.get('error', 'Unknown error')}")
+                elif embedding_status == "completed":
+                    if st.button(
+                        "Regenerate",
+                        key=f"reembed_{doc_id}",
+                        use_container_width=True,
+                        type="secondary"
+                    ):
+                        with st.spinner(f"Regenerating embeddings for {doc_name}..."):
+                            result = APIClient.generate_embeddings(doc_id)
+                            if result.get("success"):
+                                APIClient.invalidate_documents()
+                                st.session_state["_flash"] = f"Started embedding regeneration for {doc_name}"
+                                st.rerun()  # Refresh to show updated status
+                            else:
+                                st.error(f"Failed to regenerate embeddings: {result.get('error', 'Unknown error')}")
+                elif embedding_status == "processing":
+                    st.button(
+                        "Processing...",
+                        key=f"processing_{doc_id}",
+                        use_container_width=True,
+                        disabled=True
+                    )
+            else:
+                st.button(
+                    "No Document ID",
+                    key=f"no_id_{g('original_filename', 'doc')}",
+                    use_container_width=True,
+                    disabled=True
+                )
 
     @staticmethod
     def render_document_status():
         """Render the document status interface."""
+        import pandas as pd
+        
         st.title("📊 Document Status")
         
-        documents = APIClient.get_documents()
+        documents = APIClient.get_documents() or []
         if not documents:
             st.info("No documents found.")
             return
         
-        # Overall stats
+        # Overall stats, counted in a single pass
+        total_docs = processed_docs = embedded_docs = failed_docs = 0
+        for d in documents:
+            g = d.get
+            total_docs += 1
+            status = g("status")
+            if status == "processed":
+                processed_docs += 1
+            elif status == "failed":
+                failed_docs += 1
+            if g("embedding_status") == "completed":
+                embedded_docs += 1
+        
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            total_docs = len(documents)
             st.metric("Total Documents", total_docs)
         
         with col2:
-            processed_docs = sum(1 for d in documents if d.get("status") == "processed")
             st.metric("Processed", processed_docs)
         
         with col3:
-            embedded_docs = sum(1 for d in documents if d.get("embedding_status") == "completed")
             st.metric("Embedded", embedded_docs)
         
         with col4:
-            failed_docs = sum(1 for d in documents if d.get("status") == "failed")
             st.metric("Failed", failed_docs)
         
         # Status table
         st.subheader("Document Processing Status")
         
-        status_data = []
-        for doc in documents:
-            status_data.append({
-                "Name": doc.get("original_filename", "Unnamed"),
-                "Processing Status": doc.get("status", "Unknown"),
-                "Embedding Status": doc.get("embedding_status", "Not started"),
-                "Error": doc.get("error", ""),
-                "Last Updated": format_datetime(doc.get("updated_at", "")),
-                "Actions": doc.get("id", "")
-            })
+        # Same wall-clock formatting as the rest of the UI; format_datetime's
+        # parse is memoized, so repeated timestamps aren't parsed again per rerun
+        last_updated = [format_datetime(d.get("updated_at", "")) for d in documents]
         
-        df = pd.DataFrame(status_data)
+        # Build the frame column-wise so pandas gets one list per column
+        df = pd.DataFrame({
+            "Name": [d.get("original_filename", "Unnamed") for d in documents],
+            "Processing Status": [d.get("status", "Unknown") for d in documents],
+            "Embedding Status": [d.get("embedding_status", "Not started") for d in documents],
+            "Error": [d.get("error", "") for d in documents],
+            "Last Updated": last_updated,
+            "Actions": [d.get("id", "") for d in documents]
+        })
         st.dataframe(
             df,
             column_config={
@@ -1,15 +1,19 @@
 import os
+from importlib.metadata import version
 from typing import Any, Dict, List, Optional
 
 # API configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000/api")
 API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))  # Fail fast when the API host is unreachable
+API_HEALTH_TIMEOUT = float(os.getenv("API_HEALTH_TIMEOUT", "5"))  # The health endpoint should answer at once
 API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
 API_RETRY_DELAY = float(os.getenv("API_RETRY_DELAY", "1.0"))
 
 # Cache configuration
 CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))  # 5 minutes
 CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+FAILURE_CACHE_TTL = float(os.getenv("FAILURE_CACHE_TTL", "2"))  # Reuse a failed request for the rest of a rerun
 
 # Session configuration
 SESSION_TIMEOUT = int(os.getenv("SESSION_TIMEOUT", "3600"))  # 1 hour
@@ -47,6 +51,14 @@ LLM_PROVIDERS = {
 DEFAULT_LLM_PROVIDER = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
 DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-4")
 
+# Precomputed selectbox lookups so forms don't rescan provider data per rerun
+PROVIDER_KEYS = tuple(LLM_PROVIDERS)
+DEFAULT_PROVIDER_INDEX = {k: i for i, k in enumerate(PROVIDER_KEYS)}.get(DEFAULT_LLM_PROVIDER, 0)
+MODEL_INDEX = {
+    provider: {model: i for i, model in enumerate(info["models"])}
+    for provider, info in LLM_PROVIDERS.items()
+}
+
 # Document configuration
 SUPPORTED_DOCUMENT_TYPES = {
     "document": [".pdf", ".doc", ".docx", ".txt", ".md"],
@@ -61,6 +73,8 @@ MAX_DOCUMENTS_PER_SESSION = int(os.getenv("MAX_DOCUMENTS_PER_SESSION", "5"))
 
 # Upload settings
 MAX_UPLOAD_SIZE_MB = 200  # Maximum file size in MB
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "8"))  # Parallel uploads/imports per batch
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", "10"))  # Files per multipart upload request
 SUPPORTED_FORMATS = ["pdf", "txt", "doc", "docx", "csv"]
 
 # Error messages
@@ -83,6 +97,25 @@ SUCCESS_MESSAGES = {
     "state_reset": "Session state reset successfully!"
 }
 
+# Sidebar "About" text. Kept here rather than in the entry script, which
+# Streamlit re-executes on every rerun; this module is imported only once.
+ABOUT_MD = """
+    ### About
+    This application allows you to chat with your documents using various LLM providers.
+    
+    ### Features
+    - Multiple document support
+    - Multiple LLM providers
+    - Context-aware responses
+    - Session management
+    - Real-time updates
+    
+    ### Environment
+    - API URL: `{}`
+    - Python: `{}`
+    - Streamlit: `{}`
+""".format(API_BASE_URL, os.getenv("PYTHON_VERSION", "Unknown"), version("streamlit"))
+
 # Icons
 ICONS = {
     "app": "📚",
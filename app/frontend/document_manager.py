@@ -1,36 +1,24 @@
-import base64
-import os
+import io
 import time
 from datetime import datetime
-from urllib.parse import urljoin
 
-import pandas as pd
-import requests
 import streamlit as st
 
-# Configuration
-API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000/api")
+from app.frontend.api import _SESSION
+from app.frontend.config import API_BASE_URL, API_CONNECT_TIMEOUT, API_TIMEOUT
+from app.frontend.utils import join_api_url
+
+_SIZE_UNITS = ("bytes", "KB", "MB", "GB", "TB")
 
-# Ensure proper URL joining that preserves the /api path
-def join_api_url(base_url, path):
-    """Join API base URL with path, ensuring the /api part is preserved.
-    This handles the case where urllib.parse.urljoin might remove the /api path."""
-    # If the base URL doesn't end with a slash, and path starts with a slash,
-    # urljoin might discard the last path component of base_url
-    if not base_url.endswith('/'):
-        base_url = base_url + '/'
-    return urljoin(base_url, path.lstrip('/'))
 
 def format_size(size_bytes):
     """Format file size from bytes to human-readable format."""
     if size_bytes < 1024:
         return f"{size_bytes} bytes"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    # Each unit is 2**10 larger, so the bit length picks the unit directly
+    # (exact for integers, unlike math.log at powers of 1024)
+    unit = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit)):.2f} {_SIZE_UNITS[unit]}"
 
 
 def format_datetime(dt_str):
@@ -42,21 +30,19 @@ def format_datetime(dt_str):
         return dt_str
 
 
-def get_all_documents():
-    """Get all documents from the API."""
-    try:
-        response = requests.get(join_api_url(API_BASE_URL, "/documents"))
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"Error fetching documents: {str(e)}")
-        return []
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_all_documents():
+    """Fetch all documents from the API, cached between reruns.
+    Raises on failure, so an error is never served from the cache."""
+    response = _SESSION.get(join_api_url(API_BASE_URL, "/documents"), timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT))
+    response.raise_for_status()
+    return response.json()
 
 
 def delete_document(document_id):
     """Delete a document from the API."""
     try:
-        response = requests.delete(join_api_url(API_BASE_URL, f"/documents/{document_id}"))
+        response = _SESSION.delete(join_api_url(API_BASE_URL, f"/documents/{document_id}"), timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT))
         response.raise_for_status()
         return True
     except Exception as e:
@@ -64,33 +50,48 @@ def delete_document(document_id):
         return False
 
 
+def stream_original_document(document_id, chunk_size=64 * 1024):
+    """Yield the original document's body in chunks as it is read from the API.
+
+    This only avoids an extra response.content copy: st.download_button needs
+    the whole file, so callers still buffer every chunk before rendering.
+    """
+    url = join_api_url(API_BASE_URL, f"/documents/{document_id}/original")
+    with _SESSION.get(url, stream=True, timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT)) as response:
+        response.raise_for_status()
+        yield from response.iter_content(chunk_size=chunk_size)
+
+
+@st.cache_data(ttl=300, max_entries=16, show_spinner=False)
+def fetch_original_document(document_id):
+    """Original document bytes, cached between reruns.
+
+    Cached as immutable bytes, which st.download_button takes directly, so
+    no file position is shared between sessions. Failures raise and are
+    therefore not cached.
+    """
+    buffer = io.BytesIO()
+    for chunk in stream_original_document(document_id):
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
 def download_original_document(document_id):
     """Download the original document."""
-    url = join_api_url(API_BASE_URL, f"/documents/{document_id}/original")
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content
+        return fetch_original_document(document_id)
     except Exception as e:
         st.error(f"Error downloading document: {str(e)}")
         return None
 
 
-def document_manager_ui():
-    """Streamlit interface for document management."""
-    st.title("Document Management")
-    
-    # Fetch documents
-    with st.spinner("Loading documents..."):
-        documents = get_all_documents()
+@st.cache_data(ttl=300, show_spinner=False)
+def get_documents_frame():
+    """Build the document table, cached so filter changes don't rebuild it."""
+    import pandas as pd  # Imported lazily to keep it out of app startup
     
-    if not documents:
-        st.info("No documents found. Upload documents using the Upload Document page.")
-        return
-    
-    # Create a DataFrame for display
     doc_data = []
-    for doc in documents:
+    for doc in fetch_all_documents():
         doc_data.append({
             "ID": doc["id"],
             "Filename": doc["original_filename"],
@@ -100,29 +101,62 @@ def document_manager_ui():
             "Upload Date": format_datetime(doc["upload_time"]),
             "Progress": doc["processing_progress"]
         })
+    return pd.DataFrame(doc_data)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_filter_options():
+    """Status and file type filter choices for the cached document table."""
+    df = get_documents_frame()
+    return ["All"] + sorted(set(df["Status"])), ["All"] + sorted(set(df["Type"]))
+
+
+def clear_document_cache():
+    """Invalidate the cached document list, table, filter choices and downloads."""
+    fetch_all_documents.clear()
+    fetch_original_document.clear()
+    get_documents_frame.clear()
+    get_filter_options.clear()
+
+
+def document_manager_ui():
+    """Streamlit interface for document management."""
+    import pandas as pd
+    
+    st.title("Document Management")
     
-    df = pd.DataFrame(doc_data)
+    # Fetch documents
+    with st.spinner("Loading documents..."):
+        try:
+            df = get_documents_frame()
+        except Exception as e:
+            st.error(f"Error fetching documents: {str(e)}")
+            return
+    
+    if df.empty:
+        st.info("No documents found. Upload documents using the Upload Document page.")
+        return
     
     # Add filters
     st.subheader("Filters")
+    status_options, type_options = get_filter_options()
     col1, col2 = st.columns(2)
     
     with col1:
         # Filter by status
-        status_options = ["All"] + sorted(list(set(df["Status"])))
         selected_status = st.selectbox("Status", status_options)
         
     with col2:
         # Filter by file type
-        type_options = ["All"] + sorted(list(set(df["Type"])))
         selected_type = st.selectbox("File Type", type_options)
     
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters as a single boolean mask; indexing returns a new frame
+    mask = pd.Series(True, index=df.index)
     if selected_status != "All":
-        filtered_df = filtered_df[filtered_df["Status"] == selected_status]
+        mask &= df["Status"] == selected_status
     if selected_type != "All":
-        filtered_df = filtered_df[filtered_df["Type"] == selected_type]
+        mask &= df["Type"] == selected_type
+    filtered_df = df[mask]
     
     # Show document count
     st.caption(f"Showing {len(filtered_df)} of {len(df)} documents")
@@ -131,62 +165,73 @@ def document_manager_ui():
     st.subheader("Documents")
     
     # Create a custom display for each document
-    for _, doc in filtered_df.iterrows():
+    rows = filtered_df[["ID", "Filename", "Type", "Size", "Status", "Upload Date", "Progress"]]
+    for doc_id, filename, file_type, size, status, upload_date, progress in rows.itertuples(index=False, name=None):
         with st.container():
             col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
             
             with col1:
-                st.markdown(f"**{doc['Filename']}**")
-                st.caption(f"ID: {doc['ID']}")
+                st.markdown(f"**{filename}**")
+                st.caption(f"ID: {doc_id}")
             
             with col2:
-                st.markdown(f"**Status:** {doc['Status']}")
-                st.caption(f"Type: {doc['Type']}")
+                st.markdown(f"**Status:** {status}")
+                st.caption(f"Type: {file_type}")
             
             with col3:
-                st.markdown(f"**Size:** {doc['Size']}")
-                st.caption(f"Uploaded: {doc['Upload Date']}")
+                st.markdown(f"**Size:** {size}")
+                st.caption(f"Uploaded: {upload_date}")
             
             with col4:
                 # Action buttons
-                if doc["Status"] == "processed":
-                    st.button("View", key=f"view_{doc['ID']}", 
-                              on_click=lambda doc_id=doc["ID"]: st.session_state.update({"current_document_id": doc_id, "page": "Document Status"}))
+                if status == "processed":
+                    st.button("View", key=f"view_{doc_id}", 
+                              on_click=lambda doc_id=doc_id: st.session_state.update({"current_document_id": doc_id, "page": "Document Status"}))
+                
+                # Download button - the file is only fetched once the user asks for it
+                if st.button("Download", key=f"download_{doc_id}"):
+                    st.session_state[f"download_ready_{doc_id}"] = True
                 
-                # Download button
-                doc_content = download_original_document(doc['ID'])
-                if doc_content:
-                    b64 = base64.b64encode(doc_content).decode()
-                    download_link = f'<a href="data:application/octet-stream;base64,{b64}" download="{doc["Filename"]}">Download</a>'
-                    st.markdown(download_link, unsafe_allow_html=True)
+                if st.session_state.get(f"download_ready_{doc_id}", False):
+                    doc_content = download_original_document(doc_id)
+                    if doc_content is not None:
+                        st.download_button(
+                            "Save File",
+                            data=doc_content,
+                            file_name=filename,
+                            mime="application/octet-stream",
+                            key=f"save_{doc_id}"
+                        )
                 
                 # Delete button with confirmation
-                if st.button("Delete", key=f"delete_{doc['ID']}"):
-                    st.session_state[f"confirm_delete_{doc['ID']}"] = True
+                if st.button("Delete", key=f"delete_{doc_id}"):
+                    st.session_state[f"confirm_delete_{doc_id}"] = True
                 
-                if st.session_state.get(f"confirm_delete_{doc['ID']}", False):
-                    st.warning(f"Are you sure you want to delete {doc['Filename']}?")
+                if st.session_state.get(f"confirm_delete_{doc_id}", False):
+                    st.warning(f"Are you sure you want to delete {filename}?")
                     col1, col2 = st.columns(2)
                     with col1:
-                        if st.button("Yes", key=f"yes_{doc['ID']}"):
-                            if delete_document(doc['ID']):
+                        if st.button("Yes", key=f"yes_{doc_id}"):
+                            if delete_document(doc_id):
+                                clear_document_cache()
                                 st.success("Document deleted successfully")
-                                st.session_state[f"confirm_delete_{doc['ID']}"] = False
+                                st.session_state[f"confirm_delete_{doc_id}"] = False
                                 time.sleep(1)
                                 st.experimental_rerun()
                     with col2:
-                        if st.button("No", key=f"no_{doc['ID']}"):
-                            st.session_state[f"confirm_delete_{doc['ID']}"] = False
+                        if st.button("No", key=f"no_{doc_id}"):
+                            st.session_state[f"confirm_delete_{doc_id}"] = False
                             st.experimental_rerun()
             
             # Show progress bar for documents in processing
-            if doc["Status"] == "processing":
-                st.progress(doc['Progress'])
+            if status == "processing":
+                st.progress(progress)
             
             st.markdown("---")
     
     # Refresh button
     if st.button("Refresh Document List"):
+        clear_document_cache()
         st.experimental_rerun()
 
 
@@ -8,10 +8,13 @@ from app.frontend.callbacks import Callbacks
 from app.frontend.config import (
     DEFAULT_LLM_MODEL,
     DEFAULT_LLM_PROVIDER,
+    DEFAULT_PROVIDER_INDEX,
     ERROR_MESSAGES,
     ICONS,
     LLM_PROVIDERS,
     MAX_DOCUMENTS_PER_SESSION,
+    MODEL_INDEX,
+    PROVIDER_KEYS,
     SUCCESS_MESSAGES,
 )
 from app.frontend.state import SessionState
@@ -42,7 +45,10 @@ class Forms:
             
         # Auto-generate session name if not provided
         if not session_name:
-            session_name = generate_session_name(selected_docs)
+            selected = set(selected_docs)
+            session_name = generate_session_name(
+                [doc for doc in APIClient.get_documents() if doc.get("id") in selected]
+            )
         
         # Create chat session
         with st.spinner("Creating chat session..."):
@@ -69,8 +75,8 @@ class Forms:
         st.session_state["create_session_key_prefix"] = key_prefix
         
         # Fetch documents for selection
-        documents = APIClient.get_documents()
-        if not documents:
+        doc_labels = APIClient.get_document_options()
+        if not doc_labels:
             st.error(ERROR_MESSAGES["document_not_found"])
             return
             
@@ -78,7 +84,8 @@ class Forms:
         st.subheader(f"{ICONS['new']} Create New Chat Session")
         selected_docs = st.multiselect(
             "Select Documents",
-            options=documents,
+            options=list(doc_labels),
+            format_func=doc_labels.get,
             key=f"{key_prefix}_doc_select",
             help=f"Choose up to {MAX_DOCUMENTS_PER_SESSION} documents to chat about.",
             max_selections=MAX_DOCUMENTS_PER_SESSION
@@ -96,10 +103,10 @@ class Forms:
         with col1:
             llm_provider = st.selectbox(
                 "LLM Provider",
-                options=list(LLM_PROVIDERS.keys()),
+                options=PROVIDER_KEYS,
                 format_func=lambda x: LLM_PROVIDERS[x]["name"],
                 key=f"{key_prefix}_llm_provider",
-                index=list(LLM_PROVIDERS.keys()).index(DEFAULT_LLM_PROVIDER)
+                index=DEFAULT_PROVIDER_INDEX
             )
         with col2:
             available_models = LLM_PROVIDERS[llm_provider]["models"]
@@ -108,7 +115,7 @@ class Forms:
                 "Model",
                 options=available_models,
                 key=f"{key_prefix}_llm_model",
-                index=available_models.index(default_model)
+                index=MODEL_INDEX[llm_provider].get(default_model, 0)
             )
         
         # Submit button
@@ -1,14 +1,98 @@
-import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
 
 import streamlit as st
 
 from app.frontend.api import APIClient
-from app.frontend.bare_bones_upload_page import bare_bones_upload_page
 from app.frontend.components import UIComponents
+from app.frontend.config import ABOUT_MD, UPLOAD_BATCH_SIZE, UPLOAD_CONCURRENCY
 from app.frontend.state import SessionState
 from app.frontend.utils import format_file_size
 
+STATIC_DIR = Path(__file__).parent / "static"
+
+# A newline plus any surrounding non-newline whitespace
+LINE_SPLIT_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+
+# Sidebar navigation: (label, widget key, view)
+NAV_ITEMS = (
+    ("💬 Chat Sessions", "nav_chat", "main"),
+    ("📄 Document Manager", "nav_docs", "documents"),
+    ("📤 Upload Documents", "nav_upload", "upload"),
+    ("🔍 Search & Embeddings", "nav_search", "search"),
+    ("📊 Document Status", "nav_status", "status"),
+)
+
+@st.cache_data(show_spinner=False)
+def load_css() -> str:
+    """Return the app stylesheet, read from disk only on first use."""
+    return (STATIC_DIR / "app.css").read_text(encoding="utf-8")
+
+
+def split_lines(text: str) -> list:
+    """Split a text area into its stripped, non-empty lines."""
+    return [line for line in LINE_SPLIT_RE.split(text.strip()) if line]
+
+
+def record_successes(results, imported: set):
+    """Pass (name, response) pairs through, adding each successful name to imported."""
+    for name, response in results:
+        if response and response.get("success"):
+            imported.add(name)
+        yield name, response
+
+
+def upload_batch_size(total: int) -> int:
+    """Files per multipart request for a selection of total files.
+
+    Capped at UPLOAD_BATCH_SIZE, but never so large that fewer batches than
+    UPLOAD_CONCURRENCY workers are sent, since results only show up a batch at a time.
+    """
+    return max(1, min(UPLOAD_BATCH_SIZE, -(-total // UPLOAD_CONCURRENCY)))
+
+
+def render_batch_progress(results, total, action="Processed"):
+    """Consume (name, response) pairs, reporting progress in place.
+
+    A progress bar and one status line are updated as each item finishes, so
+    every update has the same small size however large the batch. Only
+    failures get an element of their own. Returns (successful, failed) counts.
+    """
+    progress_bar = st.progress(0.0)
+    status = st.empty()
+    successful = failed = 0
+    
+    for done, (name, response) in enumerate(results, start=1):
+        if response and response.get("success"):
+            successful += 1
+        else:
+            error_msg = response.get("error", "Unknown error") if response else "Failed to get response from API"
+            st.error(f"✗ {name}: {error_msg}")
+            failed += 1
+        status.info(f"{action} {done} of {total}: {name}")
+        progress_bar.progress(done / total)
+    
+    status.empty()
+    return successful, failed
+
+
+def run_batch(func, items):
+    """Call func for every item concurrently, yielding (item, response) as each finishes.
+
+    The API calls are I/O-bound, so threads overlap the HTTP round trips.
+    Workers must not touch Streamlit; all rendering stays on the script thread.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(UPLOAD_CONCURRENCY, len(items)))) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result()
+            except Exception as e:
+                yield item, {"success": False, "error": str(e)}
+
 
 def create_persistent_upload_page():
     """Create a properly designed upload page that handles file uploader state correctly.
@@ -43,42 +127,54 @@ def create_persistent_upload_page():
             help="Select one or more files to upload"
         )
         
-        # Store uploaded files in session state for persistence
+        # Remember only file metadata; the uploader widget already owns the bytes,
+        # and holding the file objects here would pin them for the whole session
         if uploaded_files:
-            st.session_state.uploaded_files = uploaded_files
+            st.session_state.uploaded_files_metadata = [
+                {"name": file.name, "size": file.size, "type": file.type}
+                for file in uploaded_files
+            ]
             
-            # Show file information
+            # Show file information; the list is rebuilt only when the selection changes
             st.write(f"Selected {len(uploaded_files)} files:")
-            for file in uploaded_files:
-                st.write(f"📄 {file.name} ({format_file_size(file.size)})")
+            file_list_sig = tuple((file.name, file.size) for file in uploaded_files)
+            if st.session_state.get("_file_list_sig") != file_list_sig:
+                st.session_state["_file_list_sig"] = file_list_sig
+                st.session_state["_file_list_md"] = "\n\n".join(
+                    f"📄 {name} ({format_file_size(size)})" for name, size in file_list_sig
+                )
+            st.markdown(st.session_state["_file_list_md"])
             
             # Process button with a unique key
             if st.button("Upload Selected Files", key="upload_btn", type="primary"):
                 with st.spinner("Processing files..."):
-                    for file in uploaded_files:
-                        try:
-                            # Call API to process the file
-                            st.info(f"Processing: {file.name}")
-                            # Read file content
-                            file_content = file.read()
-                            file_name = file.name
-                            
-                            # Make the actual API call to upload the file
-                            response = APIClient.upload_document(
-                                file_name=file_name,
-                                file_content=file_content,
-                                content_type=file.type
-                            )
-                            
-                            if response and response.get("success"):
-                                st.success(f"✓ Uploaded: {file.name}")
-                            else:
-                                error_msg = response.get("error", "Unknown error") if response else "Failed to get response from API"
-                                st.error(f"Error uploading {file.name}: {error_msg}")
-                        except Exception as e:
-                            st.error(f"Error uploading {file.name}: {str(e)}")
+                    # Hand the file objects straight to the client; no extra read() copy
+                    payloads = [
+                        {"file_name": file.name, "file_content": file, "content_type": file.type}
+                        for file in uploaded_files
+                    ]
                     
-                    st.success(f"Successfully processed {len(uploaded_files)} files")
+                    # Send files in multipart batches, several batches at a time.
+                    # Batches shrink so every worker gets one, so small selections
+                    # go up a file per request and report each file as it lands
+                    batch_size = upload_batch_size(len(payloads))
+                    batches = [
+                        payloads[i:i + batch_size]
+                        for i in range(0, len(payloads), batch_size)
+                    ]
+                    results = (
+                        (payload["file_name"], response)
+                        for batch, responses in run_batch(APIClient.upload_documents_batch, batches)
+                        for payload, response in zip(batch, responses)
+                    )
+                    successful_uploads, failed_uploads = render_batch_progress(
+                        results, len(payloads), action="Uploaded"
+                    )
+                    
+                    if successful_uploads > 0:
+                        st.success(f"Successfully processed {successful_uploads} files")
+                    if failed_uploads > 0:
+                        st.error(f"Failed to upload {failed_uploads} files")
         else:
             st.info("Please select files to upload")
 
@@ -96,27 +192,21 @@ def create_persistent_upload_page():
         
         if st.button("Import from URLs", key="url_import_btn", type="primary"):
             if url_input:
-                urls = [url.strip() for url in url_input.split("\n") if url.strip()]
-                if urls:
-                    with st.spinner(f"Processing {len(urls)} URLs..."):
-                        successful_imports = 0
-                        failed_imports = 0
-                        
-                        for url in urls:
-                            try:
-                                st.info(f"Importing from: {url}")
-                                # Make actual API call to process URL
-                                response = APIClient.import_document_from_url(url=url)
-                                if response and response.get("success"):
-                                    st.success(f"✓ Imported: {url}")
-                                    successful_imports += 1
-                                else:
-                                    error_msg = response.get("error", "Unknown error") if response else "Failed to get response from API"
-                                    st.error(f"Error importing {url}: {error_msg}")
-                                    failed_imports += 1
-                            except Exception as e:
-                                st.error(f"Error importing {url}: {str(e)}")
-                                failed_imports += 1
+                urls = split_lines(url_input)
+                # Skip entries that already went through, so retrying after a
+                # partial failure only re-submits the ones that failed
+                imported = st.session_state.setdefault("_imported_urls", set())
+                pending = [url for url in urls if url not in imported]
+                if urls and not pending:
+                    st.info("These URLs were all already imported in this session.")
+                elif pending:
+                    if len(pending) < len(urls):
+                        st.caption(f"Skipping {len(urls) - len(pending)} already imported URLs")
+                    with st.spinner(f"Processing {len(pending)} URLs..."):
+                        successful_imports, failed_imports = render_batch_progress(
+                            record_successes(run_batch(APIClient.import_document_from_url, pending), imported),
+                            len(pending), action="Imported"
+                        )
                         
                         # Only show success if there were actual successes
                         if successful_imports > 0:
@@ -144,27 +234,21 @@ def create_persistent_upload_page():
         
         if st.button("Import from Paths", key="path_import_btn", type="primary"):
             if path_input:
-                paths = [path.strip() for path in path_input.split("\n") if path.strip()]
-                if paths:
-                    with st.spinner(f"Processing {len(paths)} paths..."):
-                        successful_imports = 0
-                        failed_imports = 0
-                        
-                        for path in paths:
-                            try:
-                                st.info(f"Importing from: {path}")
-                                # Make actual API call to process server path
-                                response = APIClient.import_document_from_path(path=path)
-                                if response and response.get("success"):
-                                    st.success(f"✓ Imported: {path}")
-                                    successful_imports += 1
-                                else:
-                                    error_msg = response.get("error", "Unknown error") if response else "Failed to get response from API"
-                                    st.error(f"Error importing {path}: {error_msg}")
-                                    failed_imports += 1
-                            except Exception as e:
-                                st.error(f"Error importing {path}: {str(e)}")
-                                failed_imports += 1
+                paths = split_lines(path_input)
+                # Skip entries that already went through, so retrying after a
+                # partial failure only re-submits the ones that failed
+                imported = st.session_state.setdefault("_imported_paths", set())
+                pending = [path for path in paths if path not in imported]
+                if paths and not pending:
+                    st.info("These paths were all already imported in this session.")
+                elif pending:
+                    if len(pending) < len(paths):
+                        st.caption(f"Skipping {len(paths) - len(pending)} already imported paths")
+                    with st.spinner(f"Processing {len(pending)} paths..."):
+                        successful_imports, failed_imports = render_batch_progress(
+                            record_successes(run_batch(APIClient.import_document_from_path, pending), imported),
+                            len(pending), action="Imported"
+                        )
                         
                         # Only show success if there were actual successes
                         if successful_imports > 0:
@@ -191,6 +275,30 @@ def create_persistent_upload_page():
             st.rerun()
 
 
+def render_upload_view():
+    """Render the upload page, falling back to the bare-bones page on error."""
+    # Try the persistent version first, fallback to bare bones if it fails
+    try:
+        create_persistent_upload_page()
+    except Exception as e:
+        st.error(f"Error with persistent upload page: {str(e)}")
+        st.warning("Falling back to simplified upload page...")
+        # Only needed on this error path, so imported on demand
+        from app.frontend.bare_bones_upload_page import bare_bones_upload_page
+        bare_bones_upload_page()
+
+
+# View name -> renderer, resolved with a single dict lookup per rerun
+VIEW_ROUTES = {
+    "main": UIComponents.render_chat_page,
+    "new_chat": UIComponents.render_new_chat_form,
+    "documents": UIComponents.render_document_manager,
+    "status": UIComponents.render_document_status,
+    "upload": render_upload_view,
+    "search": UIComponents.render_search_page,
+}
+
+
 def main():
     """Main application entry point."""
     # Set page config
@@ -201,83 +309,8 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Custom CSS
-    st.markdown("""
-        <style>
-        /* Main container */
-        .main > div {
-            padding-left: 2rem;
-            padding-right: 2rem;
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-
-        /* Sidebar */
-        .css-1d391kg {
-            width: 24rem;
-        }
-        section[data-testid="stSidebar"] {
-            width: 24rem !important;
-            background-color: #1E1E1E;
-            position: fixed;
-            left: 0;
-            top: 0;
-            height: 100vh;
-            overflow-y: auto;
-        }
-        section[data-testid="stSidebar"] > div {
-            width: 24rem !important;
-            background-color: #1E1E1E;
-            padding: 2rem 1rem;
-        }
-        
-        /* Main content positioning */
-        .main .block-container {
-            padding-left: 26rem;
-            max-width: none;
-        }
-        
-        /* Buttons */
-        .stButton>button {
-            width: 100%;
-            margin-bottom: 0.5rem;
-        }
-        
-        /* Sidebar buttons */
-        .stSidebar .stButton>button {
-            background-color: #2E2E2E;
-            border: 1px solid #3E3E3E;
-            color: #FFFFFF;
-        }
-        .stSidebar .stButton>button:hover {
-            background-color: #3E3E3E;
-            border: 1px solid #4E4E4E;
-        }
-        
-        /* Form elements */
-        .stTextInput>div>div>input {
-            background-color: #2E2E2E;
-            color: #FFFFFF;
-        }
-        .stTextArea>div>div>textarea {
-            background-color: #2E2E2E;
-            color: #FFFFFF;
-        }
-        
-        /* Headers */
-        h1, h2, h3 {
-            color: #FFFFFF;
-        }
-        
-        /* Links */
-        a {
-            color: #4CAF50;
-        }
-        a:hover {
-            color: #45a049;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    # Custom CSS, read once per process and re-emitted from memory on reruns
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
     
     # Initialize session state
     SessionState.initialize()
@@ -293,111 +326,41 @@ def main():
         st.subheader("Navigation")
         
         # Main sections
-        st.button(
-            "💬 Chat Sessions",
-            key="nav_chat",
-            on_click=SessionState.set,
-            args=("current_view", "main"),
-            use_container_width=True,
-            type="primary" if SessionState.get("current_view") == "main" else "secondary"
-        )
-        
-        st.button(
-            "📄 Document Manager",
-            key="nav_docs",
-            on_click=SessionState.set,
-            args=("current_view", "documents"),
-            use_container_width=True,
-            type="primary" if SessionState.get("current_view") == "documents" else "secondary"
-        )
-        
-        # Upload button - simple callback
-        st.button(
-            "📤 Upload Documents",
-            key="nav_upload",
-            on_click=SessionState.set,
-            args=("current_view", "upload"),
-            use_container_width=True,
-            type="primary" if SessionState.get("current_view") == "upload" else "secondary"
-        )
-        
-        st.button(
-            "🔍 Search & Embeddings",
-            key="nav_search",
-            on_click=SessionState.set,
-            args=("current_view", "search"),
-            use_container_width=True,
-            type="primary" if SessionState.get("current_view") == "search" else "secondary"
-        )
-        
-        st.button(
-            "📊 Document Status",
-            key="nav_status",
-            on_click=SessionState.set,
-            args=("current_view", "status"),
-            use_container_width=True,
-            type="primary" if SessionState.get("current_view") == "status" else "secondary"
-        )
+        current_view = SessionState.get("current_view")
+        for label, key, view in NAV_ITEMS:
+            st.button(
+                label,
+                key=key,
+                on_click=SessionState.set,
+                args=("current_view", view),
+                use_container_width=True,
+                type="primary" if current_view == view else "secondary"
+            )
         
         # Info section
-        st.markdown("""
-            ### About
-            This application allows you to chat with your documents using various LLM providers.
-            
-            ### Features
-            - Multiple document support
-            - Multiple LLM providers
-            - Context-aware responses
-            - Session management
-            - Real-time updates
-            
-            ### Environment
-            - API URL: `{}`
-            - Python: `{}`
-            - Streamlit: `{}`
-        """.format(
-            os.getenv("API_BASE_URL", "http://localhost:8000/api"),
-            os.getenv("PYTHON_VERSION", "Unknown"),
-            st.__version__
-        ))
+        st.markdown(ABOUT_MD)
         
         # Reset button
         if st.button("Reset Session State", type="secondary"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            st.session_state.clear()
+            APIClient.check_health.cache_clear()
             st.toast("Session state reset!", icon="🔄")
             st.rerun()
     
     # Render main content in the container
     with main_container:
         try:
-            # Check API health once
-            api_health = APIClient.check_health()
-            if not api_health and SessionState.get("current_view") != "upload":
-                st.error("Backend API is not responding. Some features may be limited.")
-            
             # Get current view
             current_view = SessionState.get("current_view", "main")
             
+            # Check API health; cached for 15s and bounded by API_HEALTH_TIMEOUT
+            if current_view != "upload" and not APIClient.check_health():
+                st.error("Backend API is not responding. Some features may be limited.")
+            
             # Render appropriate view based on the current view
-            if current_view == "main":
-                UIComponents.render_chat_page()
-            elif current_view == "new_chat":
-                UIComponents.render_new_chat_form()
-            elif current_view == "documents":
-                UIComponents.render_document_manager()
-            elif current_view == "status":
-                UIComponents.render_document_status()
-            elif current_view == "upload":
-                # Try the persistent version first, fallback to bare bones if it fails
-                try:
-                    create_persistent_upload_page()
-                except Exception as e:
-                    st.error(f"Error with persistent upload page: {str(e)}")
-                    st.warning("Falling back to simplified upload page...")
-                    bare_bones_upload_page()
-            elif current_view == "search":
-                UIComponents.render_search_page()
+            render_view = VIEW_ROUTES.get(current_view)
+            if render_view:
+                render_view()
             else:
                 st.error(f"Unknown view: {current_view}")
                 if st.button("Return to Main View"):
@@ -9,36 +9,40 @@ class SessionState:
     @staticmethod
     def initialize():
         """Initialize all session state variables if they don't exist."""
-        defaults = {
-            "containers": {
-                "title": st.container(),
-                "status": st.empty(),
-                "error_recovery": st.container(),
-                "main_area": st.container(),
-            },
-            "current_view": "main",
-            "current_session_id": None,
-            "chat_sessions": [],
-            "current_session_cache": None,
-            "newly_created_session": False,
-            "sending_message": False,
-            "confirm_delete": False,
-            "deletion_succeeded": False,
-            "api_working": None,
-            "backend_issue": None,
-            "create_session_key_prefix": "main_create",
-            "create_session_success": None,
-            "ws_connection": None,
-            "ws_messages": {},
-            "file_uploader_key": "persistent_file_uploader",
-            "upload_files": None,
-            "uploaded_files_metadata": []
-        }
+        # Defaults only need setting once per session; later reruns skip
+        # building the dict (and its placeholder containers) entirely
+        if not st.session_state.get("_initialized"):
+            defaults = {
+                "containers": {
+                    "title": st.container(),
+                    "status": st.empty(),
+                    "error_recovery": st.container(),
+                    "main_area": st.container(),
+                },
+                "current_view": "main",
+                "current_session_id": None,
+                "chat_sessions": [],
+                "current_session_cache": None,
+                "newly_created_session": False,
+                "sending_message": False,
+                "confirm_delete": False,
+                "deletion_succeeded": False,
+                "api_working": None,
+                "backend_issue": None,
+                "create_session_key_prefix": "main_create",
+                "create_session_success": None,
+                "ws_connection": None,
+                "ws_messages": {},
+                "file_uploader_key": "persistent_file_uploader",
+                "upload_files": None,
+                "uploaded_files_metadata": []
+            }
+        
+            for key, value in defaults.items():
+                if key not in st.session_state:
+                    st.session_state[key] = value
+            st.session_state["_initialized"] = True
         
-        for key, value in defaults.items():
-            if key not in st.session_state:
-                st.session_state[key] = value
-                
         if "file_uploader_key" in st.session_state:
             st.session_state.file_uploader_key = st.session_state.file_uploader_key
 
@@ -63,16 +67,4 @@ class SessionState:
         """Critical method to ensure file uploader state is preserved across reruns.
         This addresses the blank screen issue that occurs when files are selected."""
         if "file_uploader_key" in st.session_state:
-            st.session_state.file_uploader_key = st.session_state.file_uploader_key
-            
-        if hasattr(st.session_state, "uploaded_files") and st.session_state.uploaded_files:
-            files_data = []
-            for file in st.session_state.uploaded_files:
-                if hasattr(file, "name") and hasattr(file, "size") and hasattr(file, "type"):
-                    files_data.append({
-                        "name": file.name,
-                        "size": file.size,
-                        "type": file.type
-                    })
-            if files_data:
-                st.session_state.uploaded_files_metadata = files_data 
\ No newline at end of file
+            st.session_state.file_uploader_key = st.session_state.file_uploader_key 
\ No newline at end of file
@@ -1,25 +1,49 @@
 import os
 import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 
+@lru_cache(maxsize=4096)
+def parse_iso_datetime(dt_str: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z'.
+
+    Cached because the same API timestamps are parsed again on every rerun.
+    """
+    return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+
+def join_api_url(base_url: str, path: str) -> str:
+    """Join an API base URL and a path, keeping the base's own path (e.g. /api).
+
+    Plain string joining: urljoin would drop the last path component of a
+    base URL without a trailing slash, and reparses the URL on every call.
+    """
+    return f"{base_url.rstrip('/')}/{path.lstrip('/')}"
+
 def format_datetime(dt_str: str) -> str:
     """Format datetime string for display."""
     try:
-        dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
+        return parse_iso_datetime(dt_str).strftime("%Y-%m-%d %H:%M:%S")
     except:
         return dt_str
 
+@lru_cache(maxsize=2048)
 def format_file_size(size_bytes: int) -> str:
-    """Format file size in bytes to human-readable format."""
+    """Format file size in bytes to human-readable format.
+
+    Cached because the same sizes are formatted again on every rerun.
+    """
     for unit in ['B', 'KB', 'MB', 'GB']:
         if size_bytes < 1024:
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024
     return f"{size_bytes:.1f} TB"
 
+def normalize_query(query: str) -> str:
+    """Collapse runs of whitespace so trivially different queries share a cache entry."""
+    return " ".join(query.split())
+
 def truncate_text(text: str, max_length: int = 100) -> str:
     """Truncate text to specified length with ellipsis."""
     if len(text) <= max_length:
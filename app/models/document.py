@@ -116,7 +116,7 @@ class DocumentResponse(BaseModel):
 
 class DocumentUploadResponse(BaseModel):
     """Response after document upload."""
-    document_id: UUID
+    document_id: Optional[UUID] = None  # None for a file that failed in a batch upload
     message: str
     status: DocumentStatus
 
@@ -140,4 +140,22 @@ class DocumentUploadRequest(BaseModel):
                 }
             ]
         }
-    } 
\ No newline at end of file
+    }
+
+
+class EmbeddingBatchQueryRequest(BaseModel):
+    """Request for querying a document's embeddings with several texts at once."""
+    queries: List[str] = Field(..., min_length=1)
+    limit: int = 5
+    page: Optional[int] = None
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "queries": ["quarterly revenue", "operating costs"],
+                    "limit": 5
+                }
+            ]
+        }
+    }
@@ -167,6 +167,53 @@ async def query_embeddings(
     Returns:
         List of results with their metadata
     """
+    results = await query_embeddings_batch(
+        collection_name=collection_name,
+        query_texts=[query_text],
+        n_results=n_results,
+        filters=filters
+    )
+    return results[0]
+
+
+def _format_query_results(results: Dict[str, Any], index: int) -> List[Dict[str, Any]]:
+    """Turn the index-th query of a ChromaDB query response into result dicts."""
+    processed_results = []
+    
+    if results and results['documents']:
+        for i, doc in enumerate(results['documents'][index]):
+            result = {
+                "text": doc,
+                "metadata": results['metadatas'][index][i] if results['metadatas'] else {},
+                "distance": results['distances'][index][i] if results['distances'] else None,
+                "id": results['ids'][index][i]
+            }
+            processed_results.append(result)
+    
+    return processed_results
+
+
+async def query_embeddings_batch(
+    collection_name: str,
+    query_texts: List[str],
+    n_results: int = 5,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Query embeddings from a collection with several query texts at once.
+    
+    All texts are embedded in one model call and searched in one collection
+    query, rather than one round trip per text.
+    
+    Args:
+        collection_name: Name of the collection to query
+        query_texts: The query texts
+        n_results: Number of results to return per query
+        filters: Optional filters to apply
+        
+    Returns:
+        One list of results with their metadata per query text, in order
+    """
     def _query():
         try:
             collection = chroma_client.get_collection(
@@ -175,28 +222,15 @@ async def query_embeddings(
             )
             
             results = collection.query(
-                query_texts=[query_text],
+                query_texts=query_texts,
                 n_results=n_results,
                 where=filters
             )
             
-            # Process results
-            processed_results = []
-            
-            if results and results['documents']:
-                for i, doc in enumerate(results['documents'][0]):
-                    result = {
-                        "text": doc,
-                        "metadata": results['metadatas'][0][i] if results['metadatas'] else {},
-                        "distance": results['distances'][0][i] if results['distances'] else None,
-                        "id": results['ids'][0][i]
-                    }
-                    processed_results.append(result)
-            
-            return processed_results
+            return [_format_query_results(results, i) for i in range(len(query_texts))]
         except Exception as e:
             print(f"Error querying embeddings: {str(e)}")
-            return []
+            return [[] for _ in query_texts]
     
     return await asyncio.get_event_loop().run_in_executor(executor, _query)
 
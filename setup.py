@@ -19,6 +19,7 @@ setup(
     url="https://github.com/yourusername/document-chat",
     packages=find_packages(),
     include_package_data=True,
+    package_data={"app.frontend": ["static/*.css"]},
     install_requires=requirements,
     python_requires=">=3.8",
     classifiers=[
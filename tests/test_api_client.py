@@ -107,4 +107,90 @@ def test_send_message(mock_responses):
     )
     
     response = APIClient.send_message(session_id, message)
-    assert response == response_message 
\ No newline at end of file
+    assert response == response_message 
+
+def test_upload_documents_batch(mock_responses):
+    """Test uploading several files in one request."""
+    mock_responses.add(
+        responses.POST,
+        APIClient.join_url("documents/upload-multiple"),
+        json=[
+            {"document_id": "doc-1", "message": "Uploaded", "status": "uploaded"},
+            {"document_id": None, "message": "Unsupported file type: .exe", "status": "failed"},
+        ],
+        status=200,
+    )
+    results = APIClient.upload_documents_batch([
+        {"file_name": "a.txt", "file_content": b"a", "content_type": "text/plain"},
+        {"file_name": "b.exe", "file_content": b"b", "content_type": None},
+    ])
+    assert results[0] == {"success": True, "data": {"document_id": "doc-1", "message": "Uploaded", "status": "uploaded"}}
+    assert results[1] == {"success": False, "error": "Unsupported file type: .exe"}
+
+def test_import_document_from_path(mock_responses):
+    """Test that a server path import posts the path as form data."""
+    mock_responses.add(
+        responses.POST,
+        APIClient.join_url("documents/upload"),
+        match=[responses.matchers.urlencoded_params_matcher(
+            {"file_path": "/data/report.pdf", "process_immediately": "true"}
+        )],
+        json={"id": "doc-1"},
+        status=201,
+    )
+    assert APIClient.import_document_from_path("/data/report.pdf") == {"success": True, "data": {"id": "doc-1"}}
+
+def test_get_documents_by_ids(mock_responses):
+    """Test that several documents are fetched in one request."""
+    mock_responses.add(
+        responses.GET,
+        APIClient.join_url("documents"),
+        match=[responses.matchers.query_param_matcher({"ids": "doc-1,doc-2"})],
+        json=[{"id": "doc-1", "original_filename": "a.pdf"}, {"id": "doc-3"}],
+        status=200,
+    )
+    docs = APIClient.get_documents_by_ids(["doc-1", "doc-2"])
+    assert docs == {"doc-1": {"id": "doc-1", "original_filename": "a.pdf"}}
+
+def test_stream_document_events(mock_responses):
+    """Test that status frames are parsed from the event stream."""
+    mock_responses.add(
+        responses.GET,
+        APIClient.join_url("documents/doc-1/events"),
+        body=(
+            'data: {"id": "doc-1", "status": "processing", "processing_progress": 0.5}\n\n'
+            ": keep-alive\n\n"
+            'data: {"id": "doc-1", "status": "processed", "processing_progress": 1.0}\n\n'
+        ),
+        content_type="text/event-stream",
+        status=200,
+    )
+    events = list(APIClient.stream_document_events("doc-1"))
+    assert events[1] is None  # keep-alive
+    assert [event["status"] for event in events if event] == ["processing", "processed"]
+    assert events[-1]["processing_progress"] == 1.0
+
+def test_search_document_batch(mock_responses):
+    """Test searching a document with several queries in one request."""
+    mock_responses.add(
+        responses.POST,
+        APIClient.join_url("documents/doc-1/embeddings/batch"),
+        match=[responses.matchers.json_params_matcher({"queries": ["revenue", "costs"], "limit": 3})],
+        json={"collection_info": {"name": "doc-1"}, "results": [[{"id": "c1"}], []]},
+        status=200,
+    )
+    response = APIClient.search_document_batch("doc-1", ["revenue", "costs"], limit=3)
+    assert response["success"] is True
+    assert response["data"]["results"] == [[{"id": "c1"}], []]
+
+def test_search_document_batch_deduplicates(mock_responses):
+    """Test that repeated queries are sent once and results scattered back."""
+    mock_responses.add(
+        responses.POST,
+        APIClient.join_url("documents/doc-1/embeddings/batch"),
+        match=[responses.matchers.json_params_matcher({"queries": ["revenue", "costs"], "limit": 5})],
+        json={"collection_info": {}, "results": [[{"id": "c1"}], [{"id": "c2"}]]},
+        status=200,
+    )
+    response = APIClient.search_document_batch("doc-1", ["revenue", "costs", "revenue"])
+    assert response["data"]["results"] == [[{"id": "c1"}], [{"id": "c2"}], [{"id": "c1"}]]
@@ -0,0 +1,44 @@
+"""Tests for the frontend utility functions."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.frontend.utils import format_datetime, format_file_size, join_api_url, normalize_query, parse_iso_datetime
+
+
+@pytest.mark.utils
+def test_format_file_size():
+    """Test file size formatting."""
+    assert format_file_size(512) == "512.0 B"
+    assert format_file_size(2048) == "2.0 KB"
+    assert format_file_size(5 * 1024 * 1024) == "5.0 MB"
+
+@pytest.mark.utils
+def test_format_file_size_is_cached():
+    """Test that repeated sizes are served from the cache."""
+    format_file_size.cache_clear()
+    format_file_size(4096)
+    format_file_size(4096)
+    info = format_file_size.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+@pytest.mark.utils
+def test_parse_iso_datetime_accepts_trailing_z():
+    """Test that 'Z' timestamps parse as UTC and bad input falls through."""
+    assert parse_iso_datetime("2024-01-02T03:04:05Z") == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert format_datetime("2024-01-02T03:04:05Z") == "2024-01-02 03:04:05"
+    assert format_datetime("not a date") == "not a date"
+
+@pytest.mark.utils
+def test_normalize_query():
+    """Test that spacing differences collapse to one query."""
+    assert normalize_query("  revenue   by\tregion \n") == "revenue by region"
+    assert normalize_query("Revenue") == "Revenue"
+
+@pytest.mark.utils
+def test_join_api_url():
+    """Test that the base URL's /api path survives joining."""
+    assert join_api_url("http://host/api", "/documents") == "http://host/api/documents"
+    assert join_api_url("http://host/api/", "documents") == "http://host/api/documents"